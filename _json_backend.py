@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+JSON backend selection
+======================
+
+Picks the fastest JSON library available at import time:
+orjson, then msgspec, then ujson, then the standard library
+(orjson has no PyPy wheels, so PyPy typically ends up on stdlib).
+
+    loads(bytes_or_str) -> object
+    dumps(obj, indent=False, default=None) -> bytes
+        (default converts otherwise unserializable values; non-str dict
+        keys are stringified like stdlib json does)
+    DecodeError: exception type(s) raised by loads on invalid input
+"""
+
+import json
+import logging
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+
+    BACKEND = 'orjson'
+    DecodeError = orjson.JSONDecodeError
+    loads = orjson.loads
+
+    def dumps(obj: Any, indent: bool = False, default: Optional[Callable] = None) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, default=default, option=option)
+except ImportError:
+    try:
+        import msgspec
+
+        BACKEND = 'msgspec'
+        DecodeError = (msgspec.DecodeError, ValueError)
+        loads = msgspec.json.decode
+
+        def dumps(obj: Any, indent: bool = False, default: Optional[Callable] = None) -> bytes:
+            encoded = msgspec.json.encode(obj, enc_hook=default)
+            return msgspec.json.format(encoded, indent=2) if indent else encoded
+    except ImportError:
+        try:
+            import ujson
+
+            BACKEND = 'ujson'
+            DecodeError = ValueError
+            loads = ujson.loads
+
+            def dumps(obj: Any, indent: bool = False, default: Optional[Callable] = None) -> bytes:
+                return ujson.dumps(obj, indent=2 if indent else 0, default=default).encode()
+        except ImportError:
+            BACKEND = 'json'
+            DecodeError = ValueError
+            loads = json.loads
+
+            def dumps(obj: Any, indent: bool = False, default: Optional[Callable] = None) -> bytes:
+                if indent:
+                    return json.dumps(obj, indent=2, default=default).encode()
+                return json.dumps(obj, separators=(',', ':'), default=default).encode()
+
+logger.info("JSON backend: %s", BACKEND)
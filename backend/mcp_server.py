@@ -15,6 +15,10 @@ from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 from flask import Flask, request, jsonify, render_template_string
 
+# Tool argument formats: colon-separated MAC and 24-hour H:MM / HH:MM
+_MAC_RE = re.compile(r'[0-9A-Fa-f]{2}(:[0-9A-Fa-f]{2}){5}')
+_TIME_RE = re.compile(r'([01]?[0-9]|2[0-3]):[0-5][0-9]')
+
 
 class MCPOrchestrator:
     """Orchestrates AI chat with tool calling for parental controls"""
@@ -28,6 +32,9 @@ class MCPOrchestrator:
         self.ollama_model = ollama_model
         self.logger = logger or logging.getLogger(__name__)
         
+        # Tool definitions are static; built once and shared (treat as read-only)
+        self._tools = self._build_tools()
+        
         # Simple in-memory session store for conversation history
         self.sessions = {}
         
@@ -112,16 +119,18 @@ Always prioritize safety and ask for clarification when requests are ambiguous."
 
     def _validate_mac_address(self, mac: str) -> bool:
         """Validate MAC address format"""
-        mac_pattern = r'^[0-9A-Fa-f]{2}(:[0-9A-Fa-f]{2}){5}$'
-        return bool(re.match(mac_pattern, mac))
+        return _MAC_RE.fullmatch(mac) is not None
 
     def _validate_time_format(self, time_str: str) -> bool:
         """Validate HH:MM 24-hour format"""
-        time_pattern = r'^([01]?[0-9]|2[0-3]):[0-5][0-9]$'
-        return bool(re.match(time_pattern, time_str))
+        return _TIME_RE.fullmatch(time_str) is not None
 
     def get_tools(self) -> List[Dict]:
         """Return tool definitions for Ollama function calling"""
+        return self._tools
+
+    def _build_tools(self) -> List[Dict]:
+        """Build the tool definitions returned by get_tools"""
         return [
             {
                 "type": "function",
@@ -68,6 +68,7 @@ echo "✅ Files deployed successfully"
 if [ -f "pi_backend_nintendo.py" ]; then
     echo "📤 Deploying enhanced backend..."
     scp "pi_backend_nintendo.py" "$PI_USER@$PI_IP:$PI_PATH/backend/"
+    scp "_json_backend.py" "$PI_USER@$PI_IP:$PI_PATH/backend/"
     echo "✅ Backend deployed"
 fi
 
@@ -17,6 +17,10 @@ Author: Parental Controls System
 Version: 2.0.0
 """
 
+import bisect
+import platform
+import random
+import re
 import socket
 import struct
 import time
@@ -27,9 +31,49 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import logging
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# rtnetlink constants (linux/rtnetlink.h, linux/neighbour.h)
+RTMGRP_NEIGH = 0x4
+RTM_NEWNEIGH = 28
+RTM_DELNEIGH = 29
+NDA_DST = 1
+NDA_LLADDR = 2
+NUD_INCOMPLETE = 0x01
+NUD_FAILED = 0x20
+
+IS_WINDOWS = platform.system().lower() == 'windows'
+
+PROC_NET_ARP = '/proc/net/arp'
+INCOMPLETE_MAC = '00:00:00:00:00:00'
+_MAC_RE = re.compile(r'([0-9a-fA-F]{2}[:-]){5}[0-9a-fA-F]{2}')
+
+# Per-device RTT history used for activity/jitter analysis
+RTT_WINDOW = 20
+
+# Mean RTT (ms) upper bounds and the activity profile for each band
+ACTIVITY_RTT_THRESHOLDS = (10, 25)
+ACTIVITY_PROFILES = (
+    ('high', True, 85, 'high_activity'),      # Very responsive
+    ('medium', True, 60, 'medium_activity'),  # Moderate response
+    ('low', False, 25, None),                 # Slower response, likely idle
+)
+
+# When kernel neighbour events are available the active probe loop only
+# needs to run as a slow safety net
+NETLINK_IDLE_FACTOR = 10
+
+# Up to this fraction of the interval is added to each monitoring wait so the
+# probe sweep drifts instead of firing in lockstep with other timers
+MONITOR_JITTER = 0.1
+
 class EnhancedNintendoSwitchDiscovery:
     """Enhanced Nintendo Switch network discovery and monitoring"""
     
@@ -56,6 +100,21 @@ class EnhancedNintendoSwitchDiscovery:
         self.device_states = {}
         self.monitoring_active = False
         self.monitor_thread = None
+        self._stop = threading.Event()
+        
+        # Passive ARP observation via rtnetlink (Linux only)
+        self._mac_cache: Dict[str, str] = {}
+        self._neighbor_event = threading.Event()
+        # Set while a sweep runs; our own pings/port scans churn the ARP
+        # entries, and those echoes must not wake the monitor
+        self._sweeping = threading.Event()
+        self._neighbor_thread = None
+        self._neighbor_socket = None
+        
+        # RTT ring buffers keyed by IP
+        self._rtt_window: Dict[str, any] = {}
+        self._rtt_head: Dict[str, int] = {}
+        self._rtt_count: Dict[str, int] = {}
         
     def scan_nintendo_switch_ports(self, ip: str) -> Dict[str, any]:
         """Scan Nintendo Switch specific ports to determine device state"""
@@ -99,24 +158,21 @@ class EnhancedNintendoSwitchDiscovery:
             start_time = time.time()
             
             # Use platform-specific ping
-            import platform
-            if platform.system().lower() == 'windows':
+            if IS_WINDOWS:
                 cmd = ['ping', '-n', '1', '-w', str(int(timeout * 1000)), ip]
             else:
                 cmd = ['ping', '-c', '1', '-W', str(int(timeout)), ip]
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout + 1)
+            # Only the exit status matters, so don't capture/decode ping's output
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                    timeout=timeout + 1)
             end_time = time.time()
             
             if result.returncode == 0:
                 response_time = (end_time - start_time) * 1000  # Convert to milliseconds
-                return {
-                    'success': True,
-                    'response_time': round(response_time, 2),
-                    'output': result.stdout
-                }
+                return {'success': True, 'response_time': round(response_time, 2)}
             else:
-                return {'success': False, 'response_time': None, 'output': result.stderr}
+                return {'success': False, 'response_time': None, 'output': f'Exit status {result.returncode}'}
                 
         except subprocess.TimeoutExpired:
             return {'success': False, 'response_time': None, 'output': 'Timeout'}
@@ -136,9 +192,17 @@ class EnhancedNintendoSwitchDiscovery:
     
     def get_device_mac_address(self, ip: str) -> Optional[str]:
         """Get MAC address of device via ARP table"""
+        cached = self._mac_cache.get(ip)
+        if cached:
+            return cached
+            
         try:
-            import platform
-            if platform.system().lower() == 'windows':
+            return self._read_proc_arp(ip)
+        except OSError:
+            pass  # No /proc (e.g. Windows/macOS), fall back to the arp command
+            
+        try:
+            if IS_WINDOWS:
                 cmd = ['arp', '-a', ip]
             else:
                 cmd = ['arp', '-n', ip]
@@ -146,11 +210,8 @@ class EnhancedNintendoSwitchDiscovery:
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
             
             if result.returncode == 0:
-                output = result.stdout
                 # Parse MAC address from ARP output
-                import re
-                mac_pattern = r'([0-9a-fA-F]{2}[:-]){5}[0-9a-fA-F]{2}'
-                match = re.search(mac_pattern, output)
+                match = _MAC_RE.search(result.stdout)
                 if match:
                     return match.group(0).upper()
                     
@@ -159,6 +220,60 @@ class EnhancedNintendoSwitchDiscovery:
             
         return None
     
+    @staticmethod
+    def _read_proc_arp(ip: str) -> Optional[str]:
+        """Look up an IP in the kernel ARP table without spawning arp"""
+        with open(PROC_NET_ARP) as f:
+            next(f, None)  # Header row
+            for line in f:
+                fields = line.split()
+                if len(fields) < 4 or fields[0] != ip:
+                    continue
+                mac = fields[3]
+                return None if mac == INCOMPLETE_MAC else mac.upper()
+        return None
+    
+    def record_rtt(self, ip: str, rtt: float):
+        """Append a ping RTT to the device's ring buffer"""
+        window = self._rtt_window.get(ip)
+        if window is None:
+            window = np.zeros(RTT_WINDOW) if NUMPY_AVAILABLE else [0.0] * RTT_WINDOW
+            self._rtt_window[ip] = window
+            self._rtt_head[ip] = 0
+            self._rtt_count[ip] = 0
+            
+        head = self._rtt_head[ip]
+        window[head] = rtt
+        self._rtt_head[ip] = (head + 1) % RTT_WINDOW
+        self._rtt_count[ip] = min(self._rtt_count[ip] + 1, RTT_WINDOW)
+    
+    def reset_rtt(self, ip: str):
+        """Forget a device's RTT history (it went offline)"""
+        self._rtt_window.pop(ip, None)
+        self._rtt_head.pop(ip, None)
+        self._rtt_count.pop(ip, None)
+    
+    def get_rtt_stats(self, ip: str) -> Optional[Tuple[float, float, float]]:
+        """Return (mean, p95, jitter) in ms over the device's RTT window"""
+        count = self._rtt_count.get(ip, 0)
+        if not count:
+            return None
+            
+        # The buffer fills from index 0, so the first `count` slots are valid
+        rtts = self._rtt_window[ip][:count]
+        if NUMPY_AVAILABLE:
+            return float(rtts.mean()), float(np.percentile(rtts, 95)), float(rtts.std())
+            
+        mean = sum(rtts) / count
+        # Linear interpolation between closest ranks, as np.percentile does
+        ordered = sorted(rtts)
+        pos = 0.95 * (count - 1)
+        lower = int(pos)
+        upper = min(lower + 1, count - 1)
+        p95 = ordered[lower] + (ordered[upper] - ordered[lower]) * (pos - lower)
+        jitter = (sum((r - mean) ** 2 for r in rtts) / count) ** 0.5
+        return mean, p95, jitter
+    
     def detect_nintendo_switch_activity(self, ip: str) -> Dict[str, any]:
         """Detect Nintendo Switch specific activity patterns"""
         activity_data = {
@@ -171,33 +286,34 @@ class EnhancedNintendoSwitchDiscovery:
         
         try:
             # Multiple rapid pings to detect activity patterns
-            ping_times = []
+            burst = []
             for _ in range(5):
                 ping_result = self.advanced_ping(ip, timeout=1.0)
                 if ping_result['success']:
-                    ping_times.append(ping_result['response_time'])
+                    self.record_rtt(ip, ping_result['response_time'])
+                    burst.append(ping_result['response_time'])
                 time.sleep(0.2)
             
-            if len(ping_times) >= 3:
+            if len(burst) < 3:
+                # Offline (or nearly): don't let old samples colour the next session
+                self.reset_rtt(ip)
+            else:
                 activity_data['device_active'] = True
-                avg_response = sum(ping_times) / len(ping_times)
+                mean_rtt, p95_rtt, jitter = self.get_rtt_stats(ip)
+                activity_data['rtt_mean_ms'] = round(mean_rtt, 2)
+                activity_data['rtt_p95_ms'] = round(p95_rtt, 2)
+                activity_data['rtt_jitter_ms'] = round(jitter, 2)
                 
-                # Analyze response patterns to estimate activity
-                if avg_response < 10:  # Very responsive
-                    activity_data['network_activity_level'] = 'high'
-                    activity_data['estimated_game_activity'] = True
-                    activity_data['activity_score'] = 85
-                    activity_data['possible_game'] = self.guess_game_from_activity('high_activity')
-                elif avg_response < 25:  # Moderate response
-                    activity_data['network_activity_level'] = 'medium' 
-                    activity_data['estimated_game_activity'] = True
-                    activity_data['activity_score'] = 60
-                    activity_data['possible_game'] = self.guess_game_from_activity('medium_activity')
-                else:  # Slower response, likely idle
-                    activity_data['network_activity_level'] = 'low'
-                    activity_data['estimated_game_activity'] = False
-                    activity_data['activity_score'] = 25
-                    activity_data['possible_game'] = 'System Menu'
+                # Classify from this burst only; the window spans earlier sweeps
+                level, game_active, score, game_bucket = ACTIVITY_PROFILES[
+                    bisect.bisect_right(ACTIVITY_RTT_THRESHOLDS, sum(burst) / len(burst))
+                ]
+                activity_data['network_activity_level'] = level
+                activity_data['estimated_game_activity'] = game_active
+                activity_data['activity_score'] = score
+                activity_data['possible_game'] = (
+                    self.guess_game_from_activity(game_bucket) if game_bucket else 'System Menu'
+                )
                     
         except Exception as e:
             logger.error(f"Activity detection failed for {ip}: {e}")
@@ -227,7 +343,6 @@ class EnhancedNintendoSwitchDiscovery:
             ]
         }
         
-        import random
         games = games_by_activity.get(activity_level, ['Unknown Game'])
         return random.choice(games)
     
@@ -378,6 +493,115 @@ class EnhancedNintendoSwitchDiscovery:
         logger.info(f"Enhanced discovery complete: {len(discovered_devices)} devices found")
         return discovered_devices
     
+    def start_neighbor_watch(self) -> bool:
+        """Subscribe to kernel neighbour (ARP) events for known switches"""
+        if self._neighbor_thread and self._neighbor_thread.is_alive():
+            return True
+            
+        if not hasattr(socket, 'AF_NETLINK'):
+            logger.debug("Netlink not available on this platform; using timed polling")
+            return False
+            
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+            sock.bind((0, RTMGRP_NEIGH))
+            sock.settimeout(1.0)
+        except OSError as e:
+            logger.warning(f"Could not subscribe to neighbour events: {e}")
+            return False
+            
+        self._neighbor_socket = sock
+        self._neighbor_thread = threading.Thread(target=self._neighbor_watch_loop, daemon=True)
+        self._neighbor_thread.start()
+        logger.info("Watching kernel ARP cache for Nintendo Switch activity")
+        return True
+    
+    def stop_neighbor_watch(self):
+        """Stop listening for kernel neighbour events"""
+        sock, self._neighbor_socket = self._neighbor_socket, None
+        if self._neighbor_thread:
+            self._neighbor_thread.join(timeout=2)
+            self._neighbor_thread = None
+        if sock:
+            sock.close()
+    
+    def _neighbor_watch_loop(self):
+        """Receive RTM_NEWNEIGH/RTM_DELNEIGH messages until the socket is closed"""
+        sock = self._neighbor_socket
+        while self._neighbor_socket is sock:
+            try:
+                data = sock.recv(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            if not data:
+                break
+                
+            for msg_type, ip, mac, state in self._parse_neighbor_messages(data):
+                if ip not in self.known_switches:
+                    continue
+                    
+                active = msg_type == RTM_NEWNEIGH and not state & (NUD_INCOMPLETE | NUD_FAILED)
+                if active and mac:
+                    self._mac_cache[ip] = mac
+                    self.known_switches[ip]['mac'] = mac
+                    
+                logger.debug(f"Neighbour event for {ip}: {'active' if active else 'possibly offline'}")
+                if not self._sweeping.is_set():
+                    self._neighbor_event.set()
+    
+    @staticmethod
+    def _parse_neighbor_messages(data: bytes) -> List[Tuple[int, Optional[str], Optional[str], int]]:
+        """Decode IPv4 neighbour messages into (type, ip, mac, nud_state) tuples"""
+        messages = []
+        offset = 0
+        
+        while offset + 16 <= len(data):
+            msg_len, msg_type = struct.unpack_from('=IH', data, offset)
+            if msg_len < 16:
+                break
+                
+            if msg_type in (RTM_NEWNEIGH, RTM_DELNEIGH) and msg_len >= 28:
+                family, _, _, _, state, _, _ = struct.unpack_from('=BBHiHBB', data, offset + 16)
+                
+                if family == socket.AF_INET:
+                    ip = mac = None
+                    attr = offset + 28
+                    end = offset + msg_len
+                    
+                    while attr + 4 <= end:
+                        attr_len, attr_type = struct.unpack_from('=HH', data, attr)
+                        if attr_len < 4:
+                            break
+                        payload = data[attr + 4:attr + attr_len]
+                        
+                        if attr_type == NDA_DST and len(payload) == 4:
+                            ip = socket.inet_ntoa(payload)
+                        elif attr_type == NDA_LLADDR and len(payload) == 6:
+                            mac = ':'.join(f'{b:02X}' for b in payload)
+                            
+                        attr += (attr_len + 3) & ~3
+                        
+                    messages.append((msg_type, ip, mac, state))
+                    
+            offset += (msg_len + 3) & ~3
+            
+        return messages
+    
+    def _wait_for_next_cycle(self, interval: int) -> bool:
+        """Wait until the next probe cycle; returns True if monitoring was stopped"""
+        timeout = interval * (1 + random.uniform(0, MONITOR_JITTER))
+        # Sweeps are always at least one interval apart, events or not
+        if self._stop.wait(timeout):
+            return True
+        if self._neighbor_thread and self._neighbor_thread.is_alive():
+            # Past the minimum gap a neighbour event triggers the next sweep
+            # early; stop_monitoring also sets the event to wake us
+            self._neighbor_event.wait(timeout * (NETLINK_IDLE_FACTOR - 1))
+            return self._stop.is_set()
+        return False
+    
     def start_continuous_monitoring(self, interval: int = 30):
         """Start continuous monitoring of devices"""
         if self.monitoring_active:
@@ -385,9 +609,13 @@ class EnhancedNintendoSwitchDiscovery:
             return
             
         self.monitoring_active = True
+        self._stop.clear()
+        self.start_neighbor_watch()
         
         def monitor_loop():
-            while self.monitoring_active:
+            while not self._stop.is_set():
+                self._neighbor_event.clear()
+                self._sweeping.set()
                 try:
                     devices = self.discover_all_devices()
                     # Save current state
@@ -395,11 +623,14 @@ class EnhancedNintendoSwitchDiscovery:
                     self.save_monitoring_data(devices, timestamp)
                     
                     logger.info(f"Monitoring update: {len(devices)} devices checked")
-                    time.sleep(interval)
                     
                 except Exception as e:
                     logger.error(f"Monitoring error: {e}")
-                    time.sleep(interval)
+                finally:
+                    self._sweeping.clear()
+                    
+                if self._wait_for_next_cycle(interval):
+                    break
         
         self.monitor_thread = threading.Thread(target=monitor_loop, daemon=True)
         self.monitor_thread.start()
@@ -408,8 +639,12 @@ class EnhancedNintendoSwitchDiscovery:
     def stop_monitoring(self):
         """Stop continuous monitoring"""
         self.monitoring_active = False
+        self._stop.set()
+        self._neighbor_event.set()
+        self.stop_neighbor_watch()
         if self.monitor_thread:
-            self.monitor_thread.join(timeout=5)
+            self.monitor_thread.join()
+            self.monitor_thread = None
         logger.info("Monitoring stopped")
     
     def save_monitoring_data(self, devices: List[Dict], timestamp: str):
@@ -5,11 +5,18 @@ Combines Enhanced Network Discovery with Real Nintendo Parental Controls
 """
 
 import asyncio
-import json
+import atexit
+import copy
 import os
 import logging
-from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Tuple
+from datetime import datetime, timedelta, timezone
+
+from _json_backend import dumps as _dumps, loads as _loads
 
 # Enhanced Discovery import
 try:
@@ -25,150 +32,276 @@ try:
 except ImportError:
     REAL_NINTENDO_AVAILABLE = False
 
+logger = logging.getLogger(__name__)
+
+DEVICE_STATES_FILE = 'device_states.json'
+STATE_FLUSH_DELAY = 0.5  # seconds to coalesce device state writes
+AUTH_CACHE_TTL = 2.0  # seconds
+STATUS_CACHE_TTL = 1.0  # seconds
+DISCOVERY_TIMEOUT = 3.0  # seconds to wait for a scan before serving the last result
+
+# Dashboard fields not (always) provided by enhanced discovery; discovered values win
+DASHBOARD_DEFAULTS = {
+    'mac_address': None,
+    'response_time_ms': None,
+    'network_activity_level': 'unknown',
+    'estimated_game_active': False,
+    'activity_score': 0,
+    'current_session_minutes': 0,
+    'today_play_time_minutes': 0,
+    'session_active': False,
+    
+    # Default control states (will be overridden by stored states)
+    'controls_enabled': True,
+    'parental_controls_enabled': True,
+    'daily_limit_minutes': 120,
+    
+    # Discovery metadata
+    'network_discovered': True,
+    'enhanced_discovery': True,
+    'real_nintendo_controls': False,  # Will be updated if real controls available
+    'production_mode': True
+}
+
+# Stored per-device settings that override discovered values
+OVERLAY_KEYS = ('controls_enabled', 'daily_limit_minutes', 'bedtime')
+
+def _read_json_file(path: str) -> Optional[Any]:
+    """Parse a JSON file, returning None if it doesn't exist"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    return _loads(data)
+
+@dataclass(frozen=True)
+class ConfigBundle:
+    """Startup configuration, read once and handed to each subsystem"""
+    nintendo_config: Dict[str, Any] = field(default_factory=dict)
+    device_states: Dict[str, Any] = field(default_factory=dict)
+    
+    @classmethod
+    def load(cls, config_file: str, states_file: str = DEVICE_STATES_FILE) -> 'ConfigBundle':
+        """Read the Nintendo config and stored device states in one pass"""
+        parsed = {}
+        for key, path in (('nintendo_config', config_file), ('device_states', states_file)):
+            try:
+                value = _read_json_file(path)
+            except Exception as e:
+                logger.error("Error loading %s: %s", path, e)
+                value = None
+            if value is None:
+                logger.debug("%s not found, using defaults", path)
+            else:
+                parsed[key] = value
+        return cls(**parsed)
+
 class IntegratedNintendoManager:
     """Integrated Nintendo Switch Manager - Best of Both Worlds"""
     
     def __init__(self, config_file='nintendo_config.json'):
         self.config_file = config_file
+        config = ConfigBundle.load(config_file)
         
         # Initialize both systems
         self.enhanced_discovery = None
         self.real_nintendo = None
         
         # Device state storage
-        self.device_states = {}  # Store per-device toggle states
+        self.device_states = config.device_states  # Store per-device toggle states
         self.last_update = None
+        self._last_update_iso: Optional[str] = None  # Formatted once per refresh
+        
+        # Snapshot of the last get_devices() result, reused within the TTL
+        self._devices_cache: List[Dict[str, Any]] = []
+        self._devices_cache_ts = 0.0
+        self._devices_ttl = 5.0  # seconds
+        
+        # Real Nintendo devices keyed by name, rebuilt whenever they are fetched
+        self._real_by_name: Dict[str, Dict[str, Any]] = {}
+        self._real_by_name_ts = 0.0
+        
+        # Enhanced discovery runs on one worker; a slow scan keeps running in the
+        # background while callers get the previous result
+        self._discovery_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='enhanced-discovery')
+        self._discovery_future: Optional[Future] = None
+        self._last_enhanced_devices: Optional[List[Dict[str, Any]]] = None
+        
+        # Short-lived memos for polled status checks: (timestamp, value)
+        self._auth_cache = (0.0, False)
+        self._status_cache = (0.0, None)
+        
+        # Debounced device state persistence
+        self._dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_lock = threading.Lock()
+        atexit.register(self._flush)
+        
+        # Interval of the running monitor, if any
+        self._monitoring_interval: Optional[int] = None
+        
+        # Number of setter calls skipped because the value was already applied
+        self._dedup_counter = 0
+        
+        # Last value each setter applied, keyed on (device_id, setting). Only
+        # written once the value reached Nintendo (or there are no real
+        # controls to push to), so a failed push is retried on the next call
+        self._applied: Dict[Tuple[str, str], Any] = {}
         
         # Initialize Enhanced Discovery
         if ENHANCED_DISCOVERY_AVAILABLE:
             try:
                 self.enhanced_discovery = EnhancedNintendoDiscovery()
-                print("✅ Enhanced Nintendo Discovery initialized")
+                logger.info("Enhanced Nintendo Discovery initialized")
             except Exception as e:
-                print(f"❌ Enhanced Discovery failed: {e}")
+                logger.error("Enhanced Discovery failed: %s", e)
         
         # Initialize Real Nintendo Controls
         if REAL_NINTENDO_AVAILABLE:
             try:
-                self.real_nintendo = RealNintendoSwitchManager(config_file)
-                print("✅ Real Nintendo Controls initialized")
+                self.real_nintendo = RealNintendoSwitchManager(config_file, config=config.nintendo_config)
+                logger.info("Real Nintendo Controls initialized")
             except Exception as e:
-                print(f"❌ Real Nintendo Controls failed: {e}")
-        
-        # Load device states
-        self.load_device_states()
+                logger.error("Real Nintendo Controls failed: %s", e)
         
         self.enhanced_discovery_available = ENHANCED_DISCOVERY_AVAILABLE
     
-    def load_device_states(self):
-        """Load device toggle states from config"""
-        try:
-            if os.path.exists('device_states.json'):
-                with open('device_states.json', 'r') as f:
-                    self.device_states = json.load(f)
-                print(f"✅ Loaded device states: {list(self.device_states.keys())}")
-        except Exception as e:
-            print(f"❌ Error loading device states: {e}")
-    
     def save_device_states(self):
         """Save device toggle states to config"""
         try:
-            with open('device_states.json', 'w') as f:
-                json.dump(self.device_states, f, indent=2)
-            print("✅ Saved device states")
+            # Write a sibling file and rename so readers never see a partial file
+            tmp_path = DEVICE_STATES_FILE + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(_dumps(self.device_states))
+            os.replace(tmp_path, DEVICE_STATES_FILE)
+            logger.debug("Saved device states")
         except Exception as e:
-            print(f"❌ Error saving device states: {e}")
+            logger.error("Error saving device states: %s", e)
+    
+    def _mark_dirty(self):
+        """Schedule a coalesced save of device states"""
+        with self._flush_lock:
+            self._dirty = True
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(STATE_FLUSH_DELAY, self._flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    def _flush(self):
+        """Write device states if anything changed since the last save"""
+        with self._flush_lock:
+            self._flush_timer = None
+            if not self._dirty:
+                return
+            self._dirty = False
+            self.save_device_states()
     
     def is_authenticated(self) -> bool:
         """Check if authenticated (uses Real Nintendo for actual auth)"""
-        if self.real_nintendo:
-            return self.real_nintendo.is_authenticated()
-        return True  # Enhanced discovery doesn't need auth
+        if not self.real_nintendo:
+            return True  # Enhanced discovery doesn't need auth
+        
+        checked_at, authenticated = self._auth_cache
+        now = time.monotonic()
+        if now - checked_at >= AUTH_CACHE_TTL:
+            authenticated = self.real_nintendo.is_authenticated()
+            self._auth_cache = (now, authenticated)
+        return authenticated
     
     def get_devices(self) -> List[Dict[str, Any]]:
         """Get combined device information from both systems"""
+        if time.monotonic() - self._devices_cache_ts < self._devices_ttl:
+            return copy.deepcopy(self._devices_cache)
+        
+        return asyncio.run(self.get_devices_async())
+    
+    async def get_devices_async(self) -> List[Dict[str, Any]]:
+        """Get combined device information, fetching both systems concurrently"""
+        if time.monotonic() - self._devices_cache_ts < self._devices_ttl:
+            return copy.deepcopy(self._devices_cache)
+        
         devices = []
+        fetch_enhanced = self.enhanced_discovery is not None
+        fetch_real = bool(self.real_nintendo and self.is_authenticated())
+        
+        # Network scan and Nintendo API fetch are independent until the merge
+        # (run_in_executor rather than asyncio.to_thread, which needs 3.9)
+        loop = asyncio.get_running_loop()
+        enhanced_devices, real_devices = await asyncio.gather(
+            self._fetch_enhanced_devices() if fetch_enhanced else asyncio.sleep(0, []),
+            loop.run_in_executor(None, self.real_nintendo.get_devices) if fetch_real else asyncio.sleep(0, []),
+            return_exceptions=True
+        )
         
         # Start with Enhanced Discovery for live monitoring
-        if self.enhanced_discovery:
-            try:
-                enhanced_devices = self.enhanced_discovery.discover_all_devices()
-                devices = self.convert_enhanced_devices_to_dashboard_format(enhanced_devices)
-                print(f"📡 Enhanced Discovery found {len(devices)} devices")
-            except Exception as e:
-                print(f"❌ Enhanced Discovery error: {e}")
+        if isinstance(enhanced_devices, Exception):
+            logger.error("Enhanced Discovery error: %s", enhanced_devices)
+        elif fetch_enhanced:
+            devices = self.convert_enhanced_devices_to_dashboard_format(enhanced_devices)
+            logger.debug("Enhanced Discovery found %d devices", len(devices))
         
         # If we have Real Nintendo, merge the control capabilities
-        if self.real_nintendo and self.real_nintendo.is_authenticated():
-            try:
-                real_devices = self.real_nintendo.get_devices()
-                devices = self.merge_real_controls_with_enhanced_data(devices, real_devices)
-                print(f"🎮 Merged with Real Nintendo controls")
-            except Exception as e:
-                print(f"❌ Real Nintendo error: {e}")
+        if isinstance(real_devices, Exception):
+            logger.error("Real Nintendo error: %s", real_devices)
+        elif fetch_real:
+            self._index_real_devices(real_devices)
+            devices = self.merge_real_controls_with_enhanced_data(devices)
+            logger.debug("Merged with Real Nintendo controls")
         
         # Apply stored device states
         for device in devices:
-            device_id = device['device_id']
-            if device_id in self.device_states:
-                device['controls_enabled'] = self.device_states[device_id].get('controls_enabled', True)
-                device['daily_limit_minutes'] = self.device_states[device_id].get('daily_limit_minutes', 120)
+            stored = self.device_states.get(device['device_id'])
+            if stored:
+                device.update({key: stored[key] for key in OVERLAY_KEYS if key in stored})
         
-        self.last_update = datetime.now()
+        self.last_update = datetime.now(timezone.utc)
+        self._last_update_iso = self.last_update.isoformat()
+        self._devices_cache = copy.deepcopy(devices)
+        self._devices_cache_ts = time.monotonic()
+        self._status_cache = (0.0, None)
+        return devices
+    
+    def _discover_enhanced(self) -> List[Dict[str, Any]]:
+        """Run enhanced discovery and remember the result (worker thread)"""
+        devices = self.enhanced_discovery.discover_all_devices()
+        self._last_enhanced_devices = devices
         return devices
     
+    async def _fetch_enhanced_devices(self) -> List[Dict[str, Any]]:
+        """Get discovery results, falling back to the last scan if this one is slow"""
+        # Join a scan that is still running rather than queueing another one
+        if self._discovery_future is None or self._discovery_future.done():
+            self._discovery_future = self._discovery_executor.submit(self._discover_enhanced)
+        
+        pending = asyncio.wrap_future(self._discovery_future)
+        if self._last_enhanced_devices is None:
+            return await pending  # Nothing to fall back on yet
+        
+        try:
+            return await asyncio.wait_for(pending, DISCOVERY_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("Enhanced discovery exceeded %.1fs, serving previous results", DISCOVERY_TIMEOUT)
+            return self._last_enhanced_devices
+    
+    def invalidate_devices_cache(self):
+        """Force the next get_devices() call to rediscover"""
+        self._devices_cache_ts = 0.0
+        self._status_cache = (0.0, None)
+    
     def convert_enhanced_devices_to_dashboard_format(self, enhanced_devices):
         """Convert enhanced discovery data to dashboard format"""
-        dashboard_devices = []
-        for device in enhanced_devices:
-            dashboard_device = {
-                'device_id': device['device_id'],
-                'device_name': device['device_name'],
-                'device_type': device['device_type'],
-                'ip_address': device['ip_address'],
-                'mac_address': device.get('mac_address'),
-                'location': device['location'],
-                'online': device['online'],
-                'response_time_ms': device.get('response_time_ms'),
-                'last_seen': device['last_seen'],
-                
-                # Enhanced monitoring data
-                'current_game': device['current_game'],
-                'network_activity_level': device['network_activity_level'],
-                'estimated_game_active': device.get('estimated_game_activity', False),
-                'activity_score': device.get('activity_score', 0),
-                
-                # Session tracking
-                'current_session_minutes': device['current_session_minutes'],
-                'today_play_time_minutes': device['today_play_time_minutes'],
-                'session_active': device['session_active'],
-                
-                # Default control states (will be overridden by stored states)
-                'controls_enabled': True,
-                'parental_controls_enabled': True,
-                'daily_limit_minutes': 120,
-                
-                # Discovery metadata
-                'network_discovered': True,
-                'enhanced_discovery': True,
-                'real_nintendo_controls': False,  # Will be updated if real controls available
-                'production_mode': True
-            }
-            dashboard_devices.append(dashboard_device)
-        return dashboard_devices
+        defaults = DASHBOARD_DEFAULTS  # Resolve the global once, not per device
+        return [{**defaults, **device} for device in enhanced_devices]
     
-    def merge_real_controls_with_enhanced_data(self, enhanced_devices, real_devices):
+    def merge_real_controls_with_enhanced_data(self, enhanced_devices):
         """Merge real Nintendo control capabilities with enhanced monitoring data"""
-        # Create lookup for real devices
-        real_devices_lookup = {dev['device_name']: dev for dev in real_devices}
-        
         for device in enhanced_devices:
             device_name = device['device_name']
+            real_device = self._real_by_name.get(device_name)
             
             # If we have real Nintendo data for this device, merge capabilities
-            if device_name in real_devices_lookup:
-                real_device = real_devices_lookup[device_name]
-                
+            if real_device:
                 # Update with real Nintendo control capabilities
                 device['real_nintendo_controls'] = True
                 device['real_device_id'] = real_device['device_id']
@@ -177,153 +310,202 @@ class IntegratedNintendoManager:
                 # Enhanced discovery provides better real-time network monitoring
                 # Real Nintendo provides actual parental control enforcement
                 
-                print(f"🔗 Merged {device_name}: Enhanced monitoring + Real controls")
+                logger.debug("Merged %s: Enhanced monitoring + Real controls", device_name)
         
         return enhanced_devices
     
     def toggle_device_controls(self, device_id: str, enabled: bool) -> bool:
         """Toggle parental controls for a specific device"""
-        print(f"🎯 Toggling controls for {device_id}: {'ON' if enabled else 'OFF'}")
+        if self._is_applied(device_id, 'controls_enabled', enabled):
+            return self._skip_unchanged(device_id, 'controls')
+        
+        logger.debug("Toggling controls for %s: %s", device_id, enabled)
         
         # Store the state locally
         if device_id not in self.device_states:
             self.device_states[device_id] = {}
         
         self.device_states[device_id]['controls_enabled'] = enabled
-        self.save_device_states()
+        self.invalidate_devices_cache()
+        self._mark_dirty()
         
         # If we have real Nintendo controls, apply them
-        if self.real_nintendo and self.real_nintendo.is_authenticated():
+        if self.real_nintendo and self.is_authenticated():
             try:
                 # Find the real device ID for this enhanced device
                 real_device_id = self.find_real_device_id(device_id)
                 if real_device_id:
                     success = self.real_nintendo.toggle_device_controls(real_device_id, enabled)
                     if success:
-                        print(f"✅ {device_id}: Real Nintendo controls {'enabled' if enabled else 'disabled'}")
+                        logger.debug("%s: Real Nintendo controls set to %s", device_id, enabled)
+                        self._applied[(device_id, 'controls_enabled')] = enabled
                         return True
                     else:
-                        print(f"❌ {device_id}: Real Nintendo control toggle failed")
+                        logger.error("%s: Real Nintendo control toggle failed", device_id)
                         return False
                 else:
-                    print(f"⚠️  {device_id}: No matching real Nintendo device found")
+                    logger.warning("%s: No matching real Nintendo device found", device_id)
             except Exception as e:
-                print(f"❌ Error toggling real Nintendo controls for {device_id}: {e}")
+                logger.error("Error toggling real Nintendo controls for %s: %s", device_id, e)
         
         # If no real controls, just store the state (for UI feedback)
-        print(f"💾 {device_id}: State stored (controls {'enabled' if enabled else 'disabled'})")
-        print(f"⚠️  Note: Real Nintendo controls not available - state stored for future use")
+        if not self.real_nintendo:
+            self._applied[(device_id, 'controls_enabled')] = enabled
+        logger.debug("%s: State stored (controls_enabled=%s); real Nintendo controls not applied", device_id, enabled)
         return True
     
     def set_daily_playtime_limit(self, device_id: str, minutes: int) -> bool:
         """Set daily playtime limit for a device"""
-        print(f"⏰ Setting daily limit for {device_id}: {minutes} minutes")
+        if self._is_applied(device_id, 'daily_limit_minutes', minutes):
+            return self._skip_unchanged(device_id, 'daily limit')
+        
+        logger.debug("Setting daily limit for %s: %d minutes", device_id, minutes)
         
         # Store the limit locally
         if device_id not in self.device_states:
             self.device_states[device_id] = {}
         
         self.device_states[device_id]['daily_limit_minutes'] = minutes
-        self.save_device_states()
+        self.invalidate_devices_cache()
+        self._mark_dirty()
         
         # If we have real Nintendo controls, apply the limit
-        if self.real_nintendo and self.real_nintendo.is_authenticated():
+        if self.real_nintendo and self.is_authenticated():
             try:
                 real_device_id = self.find_real_device_id(device_id)
                 if real_device_id:
                     success = self.real_nintendo.set_daily_playtime_limit(real_device_id, minutes)
                     if success:
-                        print(f"✅ {device_id}: Real Nintendo daily limit set to {minutes} minutes")
+                        logger.debug("%s: Real Nintendo daily limit set to %d minutes", device_id, minutes)
+                        self._applied[(device_id, 'daily_limit_minutes')] = minutes
                         return True
                     else:
-                        print(f"❌ {device_id}: Real Nintendo limit setting failed")
+                        logger.error("%s: Real Nintendo limit setting failed", device_id)
                         return False
                 else:
-                    print(f"⚠️  {device_id}: No matching real Nintendo device found")
+                    logger.warning("%s: No matching real Nintendo device found", device_id)
             except Exception as e:
-                print(f"❌ Error setting real Nintendo limit for {device_id}: {e}")
+                logger.error("Error setting real Nintendo limit for %s: %s", device_id, e)
         
         # If no real controls, just store the limit
-        print(f"💾 {device_id}: Daily limit stored ({minutes} minutes)")
-        print(f"⚠️  Note: Real Nintendo controls not available - limit stored for future use")
+        if not self.real_nintendo:
+            self._applied[(device_id, 'daily_limit_minutes')] = minutes
+        logger.debug("%s: Daily limit stored (%d minutes); real Nintendo controls not applied", device_id, minutes)
         return True
     
     def set_bedtime(self, device_id: str, bedtime_hour: int, bedtime_minute: int) -> bool:
         """Set bedtime for a device"""
-        print(f"🌙 Setting bedtime for {device_id}: {bedtime_hour:02d}:{bedtime_minute:02d}")
+        bedtime = {'hour': bedtime_hour, 'minute': bedtime_minute}
+        if self._is_applied(device_id, 'bedtime', bedtime):
+            return self._skip_unchanged(device_id, 'bedtime')
+        
+        logger.debug("Setting bedtime for %s: %02d:%02d", device_id, bedtime_hour, bedtime_minute)
         
         # Store bedtime locally
         if device_id not in self.device_states:
             self.device_states[device_id] = {}
         
-        self.device_states[device_id]['bedtime'] = {'hour': bedtime_hour, 'minute': bedtime_minute}
-        self.save_device_states()
+        self.device_states[device_id]['bedtime'] = bedtime
+        self.invalidate_devices_cache()
+        self._mark_dirty()
         
         # If we have real Nintendo controls, apply bedtime
-        if self.real_nintendo and self.real_nintendo.is_authenticated():
+        if self.real_nintendo and self.is_authenticated():
             try:
                 real_device_id = self.find_real_device_id(device_id)
                 if real_device_id:
                     success = self.real_nintendo.set_bedtime(real_device_id, bedtime_hour, bedtime_minute)
                     if success:
-                        print(f"✅ {device_id}: Real Nintendo bedtime set")
+                        logger.debug("%s: Real Nintendo bedtime set", device_id)
+                        self._applied[(device_id, 'bedtime')] = bedtime
                         return True
                     else:
-                        print(f"❌ {device_id}: Real Nintendo bedtime setting failed")
+                        logger.error("%s: Real Nintendo bedtime setting failed", device_id)
                         return False
                 else:
-                    print(f"⚠️  {device_id}: No matching real Nintendo device found")
+                    logger.warning("%s: No matching real Nintendo device found", device_id)
             except Exception as e:
-                print(f"❌ Error setting real Nintendo bedtime for {device_id}: {e}")
+                logger.error("Error setting real Nintendo bedtime for %s: %s", device_id, e)
         
-        print(f"💾 {device_id}: Bedtime stored")
+        if not self.real_nintendo:
+            self._applied[(device_id, 'bedtime')] = bedtime
+        logger.debug("%s: Bedtime stored", device_id)
+        return True
+    
+    def _is_applied(self, device_id: str, key: str, value: Any) -> bool:
+        """True if value is both the stored state and the last value that reached Nintendo"""
+        return (self._applied.get((device_id, key)) == value
+                and self.device_states.get(device_id, {}).get(key) == value)
+    
+    def _skip_unchanged(self, device_id: str, setting: str) -> bool:
+        """Short-circuit a setter whose value was already applied"""
+        self._dedup_counter += 1
+        logger.debug("%s: %s unchanged, skipping update", device_id, setting)
         return True
     
+    def _index_real_devices(self, real_devices: List[Dict[str, Any]]):
+        """Cache real devices by name for merging and ID lookups"""
+        self._real_by_name = {dev['device_name']: dev for dev in real_devices}
+        self._real_by_name_ts = time.monotonic()
+    
     def find_real_device_id(self, enhanced_device_id: str) -> Optional[str]:
         """Find the real Nintendo device ID for an enhanced discovery device"""
         if not self.real_nintendo:
             return None
         
-        try:
-            real_devices = self.real_nintendo.get_devices()
-            
-            # Try to match by device name
-            for real_device in real_devices:
-                if real_device['device_name'] == enhanced_device_id:
-                    return real_device['device_id']
-            
-            # If no exact match, return None
-            return None
-            
-        except Exception as e:
-            print(f"❌ Error finding real device ID: {e}")
-            return None
+        # Only go back to the Nintendo API when the index is as stale as the device cache
+        if not self._real_by_name or time.monotonic() - self._real_by_name_ts >= self._devices_ttl:
+            try:
+                self._index_real_devices(self.real_nintendo.get_devices())
+            except Exception as e:
+                logger.error("Error finding real device ID: %s", e)
+                return None
+        
+        # Match by device name
+        real_device = self._real_by_name.get(enhanced_device_id)
+        return real_device['device_id'] if real_device else None
     
     def get_parental_control_status(self) -> Dict[str, Any]:
         """Get overall parental control status"""
+        cached_at, cached_status = self._status_cache
+        now = time.monotonic()
+        if cached_status is not None and now - cached_at < STATUS_CACHE_TTL:
+            return copy.deepcopy(cached_status)
+        
         status = {
             'enhanced_discovery_available': ENHANCED_DISCOVERY_AVAILABLE,
             'real_nintendo_available': REAL_NINTENDO_AVAILABLE,
             'authenticated': self.is_authenticated(),
-            'last_update': self.last_update.isoformat() if self.last_update else None,
+            'last_update': self._last_update_iso,
             'device_states_stored': len(self.device_states)
         }
         
-        # Add real Nintendo status if available
+        # Add real Nintendo status if available. This only reads the real manager's
+        # in-memory device snapshot (refreshed by get_devices), so it never triggers
+        # another Nintendo API fetch.
         if self.real_nintendo:
             real_status = self.real_nintendo.get_parental_control_status()
             status['real_nintendo_status'] = real_status
         
+        self._status_cache = (now, copy.deepcopy(status))
         return status
     
     def start_continuous_monitoring(self, interval: int = 60):
         """Start continuous monitoring (enhanced discovery)"""
         if self.enhanced_discovery:
+            if self._monitoring_interval == interval:
+                logger.debug("Continuous monitoring already running every %ds", interval)
+                return
+            
             try:
+                if self._monitoring_interval is not None:
+                    self.enhanced_discovery.stop_monitoring()
+                    self._monitoring_interval = None
                 self.enhanced_discovery.start_continuous_monitoring(interval)
-                print(f"✅ Started continuous monitoring (every {interval}s)")
+                self._monitoring_interval = interval
+                logger.info("Started continuous monitoring (every %ds)", interval)
             except Exception as e:
-                print(f"❌ Error starting continuous monitoring: {e}")
+                logger.error("Error starting continuous monitoring: %s", e)
 
 # Test function
 def test_integrated_manager():
@@ -5,16 +5,20 @@ Helps get a session token for Nintendo Parental Controls API
 """
 
 import asyncio
+import importlib.util
 import json
 import webbrowser
 from urllib.parse import urlencode, parse_qs
 
-try:
-    from pynintendoparental.authenticator import Authenticator
-    from pynintendoparental.authenticator.session_token import get_session_token
-    NINTENDO_AVAILABLE = True
-except ImportError:
-    NINTENDO_AVAILABLE = False
+# pynintendoparental is only imported when a token is actually tested
+_nintendo_available = None
+
+def nintendo_available() -> bool:
+    """Check whether pynintendoparental is installed, without importing it"""
+    global _nintendo_available
+    if _nintendo_available is None:
+        _nintendo_available = importlib.util.find_spec('pynintendoparental') is not None
+    return _nintendo_available
 
 def nintendo_auth_instructions():
     """Provide instructions for Nintendo authentication"""
@@ -68,13 +72,15 @@ def create_sample_config():
 
 def test_session_token(session_token: str):
     """Test if a session token works"""
-    if not NINTENDO_AVAILABLE:
+    try:
+        from pynintendoparental.authenticator import Authenticator
+    except ImportError:
         print("❌ Nintendo library not available")
         return False
     
     try:
-        # Test the session token
-        authenticator = Authenticator(session_token=session_token)
+        # Constructing the Authenticator is what validates the token
+        Authenticator(session_token=session_token)
         print("✅ Session token format appears valid")
         print("🧪 Testing authentication...")
         
@@ -92,7 +98,7 @@ def main():
     print("🎮 Nintendo Switch Parental Controls Authentication Helper")
     print()
     
-    if not NINTENDO_AVAILABLE:
+    if not nintendo_available():
         print("❌ Nintendo library not available!")
         print("💡 Install with: pip install pynintendoparental aiohttp")
         return
@@ -15,25 +15,88 @@ Author: Parental Controls Dashboard
 Version: 1.0.0
 """
 
-import json
+import functools
+import threading
 import time
+import certifi
 import requests
-import hashlib
-import hmac
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import base64
-import uuid
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
+import asyncio
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 import os
+import secrets
+import ssl
+import sys
+
+# httpx is optional; it is only needed for NintendoDeveloperAPIAsync
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401 - enables httpx HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# msgspec is optional; it decodes the devices response straight into structs
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Config/token/request serialization via the fastest JSON library installed
+import _json_backend
+from _json_backend import dumps as _dumps, loads as _loads
+
+# Fixed action bodies, serialized once
+_SUSPEND_BODY = _dumps({'action': 'suspend', 'immediate': True})
+_RESUME_BODY = _dumps({'action': 'resume', 'immediate': True})
+
+def _suspend_body(duration_minutes: Optional[int]) -> bytes:
+    """Suspend request body; only a timed suspension needs serializing"""
+    if not duration_minutes:
+        return _SUSPEND_BODY
+    return _dumps({'action': 'suspend', 'immediate': True, 'duration_minutes': duration_minutes})
+
+def _body_head(response: Any, limit: int = 512) -> str:
+    """First bytes of a response body for error logs, without decoding all of it"""
+    return response.content[:limit].decode('utf-8', 'replace')
+
+def _response_json(response: Any, action: str, default: Any = None) -> Any:
+    """Parse a _request() response body (requests or httpx), returning default on failure"""
+    if response is None:
+        return default
+    try:
+        return _loads(response.content)
+    except _json_backend.DecodeError as e:
+        logger.error("Invalid response while trying to %s: %s", action, e)
+        return default
+
+def _iso_or_now(value: Optional[str]) -> datetime:
+    """Parse an ISO timestamp, falling back to the current time"""
+    return datetime.fromisoformat(value) if value else datetime.now()
+
+# slots=True needs Python 3.10+; older interpreters (Pi OS) keep the __dict__ layout
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class NintendoDevice:
     """Represents a Nintendo Switch device from Developer API"""
     device_id: str
@@ -45,27 +108,203 @@ class NintendoDevice:
     play_time_today: int  # minutes
     play_time_this_week: int  # minutes
     parental_controls_enabled: bool
-    current_restrictions: Dict[str, Any]
+    current_restrictions: Dict[str, Any] = field(hash=False)
     last_seen: datetime
     firmware_version: str
     account_id: str
 
-@dataclass
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class ParentalControlSettings:
-    """Parental control configuration for a device"""
+    """Parental control configuration for a device (hashable, so policy bodies can be cached)"""
     daily_time_limit: int  # minutes
     bedtime_enabled: bool
     bedtime_start: str  # HH:MM format
     bedtime_end: str  # HH:MM format
-    allowed_software_ratings: List[str]
-    restricted_features: List[str]
+    allowed_software_ratings: Tuple[str, ...]
+    restricted_features: Tuple[str, ...]
     communication_restrictions: bool
     purchase_restrictions: bool
+    
+    def __post_init__(self):
+        # Accept lists from callers but store tuples to stay hashable
+        object.__setattr__(self, 'allowed_software_ratings', tuple(self.allowed_software_ratings))
+        object.__setattr__(self, 'restricted_features', tuple(self.restricted_features))
+
+def _device_from_data(device_data: Dict[str, Any]) -> NintendoDevice:
+    """Build a NintendoDevice from one entry of the devices response"""
+    return NintendoDevice(
+        device_id=device_data['device_id'],
+        device_name=device_data.get('device_name', 'Nintendo Switch'),
+        nickname=device_data.get('nickname', ''),
+        location=device_data.get('location', 'Unknown'),
+        online_status=device_data.get('online', False),
+        last_played_game=device_data.get('last_played_application', {}).get('name'),
+        play_time_today=device_data.get('play_time_today_minutes', 0),
+        play_time_this_week=device_data.get('play_time_week_minutes', 0),
+        parental_controls_enabled=device_data.get('parental_controls_enabled', False),
+        current_restrictions=device_data.get('current_restrictions', {}),
+        last_seen=_iso_or_now(device_data.get('last_seen')),
+        firmware_version=device_data.get('firmware_version', 'Unknown'),
+        account_id=device_data.get('linked_account_id', '')
+    )
+
+if MSGSPEC_AVAILABLE:
+    class _ApplicationWire(msgspec.Struct):
+        """Application entry in the devices response"""
+        name: Optional[str] = None
+    
+    class _DeviceWire(msgspec.Struct):
+        """Device entry in the devices response, with the same defaults as _device_from_data"""
+        device_id: str
+        device_name: str = 'Nintendo Switch'
+        nickname: str = ''
+        location: str = 'Unknown'
+        online: bool = False
+        last_played_application: Optional[_ApplicationWire] = None
+        play_time_today_minutes: int = 0
+        play_time_week_minutes: int = 0
+        parental_controls_enabled: bool = False
+        current_restrictions: Dict[str, Any] = {}
+        last_seen: Optional[str] = None
+        firmware_version: str = 'Unknown'
+        linked_account_id: str = ''
+    
+    class _DevicesWire(msgspec.Struct):
+        """Top level of the devices response"""
+        devices: List[_DeviceWire] = []
+    
+    _DEVICES_DECODER = msgspec.json.Decoder(_DevicesWire)
+
+def _parse_devices(content: bytes) -> List[NintendoDevice]:
+    """Parse a devices response body into NintendoDevice objects"""
+    if MSGSPEC_AVAILABLE:
+        try:
+            wires = _DEVICES_DECODER.decode(content).devices
+        except msgspec.ValidationError as e:
+            # e.g. a null name or a float play time; the dict path tolerates those
+            logger.debug("Devices response doesn't match the wire schema (%s); parsing as dicts", e)
+        else:
+            return [_device_from_wire(wire) for wire in wires]
+    
+    return [_device_from_data(device_data) for device_data in _loads(content).get('devices', [])]
+
+def _device_from_wire(wire: '_DeviceWire') -> NintendoDevice:
+    """Build a NintendoDevice from a decoded wire struct"""
+    return NintendoDevice(
+        device_id=wire.device_id,
+        device_name=wire.device_name,
+        nickname=wire.nickname,
+        location=wire.location,
+        online_status=wire.online,
+        last_played_game=wire.last_played_application.name if wire.last_played_application else None,
+        play_time_today=wire.play_time_today_minutes,
+        play_time_this_week=wire.play_time_week_minutes,
+        parental_controls_enabled=wire.parental_controls_enabled,
+        current_restrictions=wire.current_restrictions,
+        last_seen=_iso_or_now(wire.last_seen),
+        firmware_version=wire.firmware_version,
+        account_id=wire.linked_account_id
+    )
+
+@functools.lru_cache(maxsize=32)
+def _settings_body(settings: ParentalControlSettings) -> bytes:
+    """Serialized parental-controls update body; repeated policy pushes reuse it"""
+    return _dumps({
+        'daily_time_limit_minutes': settings.daily_time_limit,
+        'bedtime_enabled': settings.bedtime_enabled,
+        'bedtime_start': settings.bedtime_start,
+        'bedtime_end': settings.bedtime_end,
+        'allowed_software_ratings': settings.allowed_software_ratings,
+        'restricted_features': settings.restricted_features,
+        'communication_restrictions': settings.communication_restrictions,
+        'purchase_restrictions': settings.purchase_restrictions
+    })
+
+# Token files written with AES-GCM start with this marker; older ones are Fernet tokens
+_TOKEN_FILE_MAGIC = b'NPC1'
+_TOKEN_NONCE_SIZE = 12
+
+# Refresh the access token this many seconds before it actually expires
+TOKEN_REFRESH_MARGIN = 60
 
 class NintendoDeveloperAPIError(Exception):
     """Custom exception for Nintendo Developer API errors"""
     pass
 
+class _RateLimiter:
+    """Sliding one-minute window limiter shared by all API requests"""
+    
+    def __init__(self, requests_per_minute: int):
+        self.requests_per_minute = requests_per_minute
+        self._sent = deque()
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """Claim the next free slot in the window; returns seconds to wait before sending"""
+        with self._lock:
+            now = time.monotonic()
+            while self._sent and now - self._sent[0] >= 60:
+                self._sent.popleft()
+            
+            start = now
+            if len(self._sent) >= self.requests_per_minute:
+                # Send once the oldest request leaves the window
+                start = max(now, self._sent.popleft() + 60)
+            
+            self._sent.append(start)
+            return start - now
+    
+    def acquire(self):
+        """Block until another request fits in the window"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+class _Retry(Retry):
+    """
+    Retry policy for the Nintendo hosts. Idempotent methods retry transient
+    5xx/429 responses; POST (token exchanges, suspend/resume) is only re-sent
+    on 429 with Retry-After, or when the connection never got established.
+    Every retry takes a slot from the client's rate limiter.
+    """
+    
+    rate_limiter: Optional[_RateLimiter] = None
+    
+    def new(self, **kw):
+        retry = super().new(**kw)
+        retry.rate_limiter = self.rate_limiter
+        return retry
+    
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if method == 'POST':
+            return bool(self.total) and status_code == 429 and has_retry_after
+        return super().is_retry(method, status_code, has_retry_after)
+    
+    def increment(self, *args, **kwargs):
+        retry = super().increment(*args, **kwargs)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        return retry
+
+@functools.lru_cache(maxsize=1)
+def _tls_context() -> ssl.SSLContext:
+    """TLS context shared by every Nintendo connection pool"""
+    context = ssl.create_default_context(cafile=certifi.where())
+    # Session tickets are on by default; make sure nothing disabled them
+    context.options &= ~ssl.OP_NO_TICKET
+    return context
+
+class _TLSAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools all use the shared TLS context"""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['ssl_context'] = _tls_context()
+        return super().init_poolmanager(*args, **kwargs)
+    
+    def proxy_manager_for(self, *args, **kwargs):
+        kwargs['ssl_context'] = _tls_context()
+        return super().proxy_manager_for(*args, **kwargs)
+
 class NintendoDeveloperAPI:
     """
     Nintendo Developer API Client for Parental Controls
@@ -80,33 +319,93 @@ class NintendoDeveloperAPI:
         self.config = self._load_config()
         self.access_token = None
         self.refresh_token = None
-        self.token_expires_at = None
         self.authenticated = False
+        self._token_expiry = 0.0  # time.time() at which the access token expires
+        self._expires_epoch = 0.0  # time.time() at which to refresh the access token
+        self._token_lock = threading.Lock()
+        
+        # Built once; the key doesn't change for the client's lifetime.
+        # The key is 32 urlsafe-base64 bytes (the same format Fernet used)
+        self._encryption_key = self.config.get('encryption_key')
+        self._aead = AESGCM(base64.urlsafe_b64decode(self._encryption_key)) if self._encryption_key else None
+        
+        # Frequently used config values
+        self._client_id = self.config.get('client_id')
+        self._timeout = self.config.get('timeout', 30)
         
         # API endpoints
         self.base_url = self.config.get('base_url', 'https://api-lp1.znc.srv.nintendo.net')
         self.auth_url = self.config.get('auth_url', 'https://accounts.nintendo.com')
         self.api_version = self.config.get('api_version', 'v1')
         
-        # Initialize session
+        # Fixed endpoint URLs, formatted once
+        self._api_root = f"{self.base_url}/api/{self.api_version}"
+        self._devices_url = f"{self._api_root}/devices"
+        self._auth_token_url = f"{self.auth_url}/connect/1.0.0/api/token"
+        self._auth_revoke_url = f"{self.auth_url}/connect/1.0.0/api/revoke"
+        self._auth_authorize_url = f"{self.auth_url}/connect/1.0.0/authorize"
+        
+        # Initialize session; every call goes to the same two hosts, so keep
+        # a pool of live connections and retry transient failures there
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'NintendoParentalControlsApp/1.0.0',
             'Accept': 'application/json',
-            'Content-Type': 'application/json'
+            'Content-Type': 'application/json',
+            'Connection': 'keep-alive'
         })
         
+        rate_limit = self.config.get('rate_limit', {})
+        self._rate_limiter = _RateLimiter(rate_limit.get('requests_per_minute', 60))
+        
+        retries = _Retry(
+            total=self.config.get('retry_attempts', 3),
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+            respect_retry_after_header=True
+        )
+        retries.rate_limiter = self._rate_limiter
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retries)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Nintendo hosts get the shared, preconfigured TLS context
+        tls_adapter = _TLSAdapter(pool_connections=4, pool_maxsize=32, max_retries=retries)
+        for host_url in (self.base_url, self.auth_url):
+            self.session.mount(host_url, tls_adapter)
+    
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
+    
+    @property
+    def token_expires_at(self) -> Optional[datetime]:
+        """Access token expiry as a datetime, for callers that want one"""
+        return datetime.fromtimestamp(self._token_expiry) if self._token_expiry else None
+    
+    def _set_token_expiry(self, expires_in: float):
+        """Record when a freshly issued access token expires"""
+        self._token_expiry = time.time() + expires_in
+        self._expires_epoch = self._token_expiry - TOKEN_REFRESH_MARGIN
+    
+    def __enter__(self) -> 'NintendoDeveloperAPI':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from file"""
         try:
             if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    return json.load(f)
+                with open(self.config_file, 'rb') as f:
+                    return _loads(f.read())
             else:
-                logger.warning(f"Config file {self.config_file} not found. Using default configuration.")
+                logger.warning("Config file %s not found. Using default configuration.", self.config_file)
                 return self._create_default_config()
         except Exception as e:
-            logger.error(f"Error loading config: {e}")
+            logger.error("Error loading config: %s", e)
             return self._create_default_config()
     
     def _create_default_config(self) -> Dict[str, Any]:
@@ -119,7 +418,7 @@ class NintendoDeveloperAPI:
             "base_url": "https://api-lp1.znc.srv.nintendo.net",
             "auth_url": "https://accounts.nintendo.com",
             "api_version": "v1",
-            "encryption_key": Fernet.generate_key().decode(),
+            "encryption_key": base64.urlsafe_b64encode(os.urandom(32)).decode(),
             "production_mode": True,
             "rate_limit": {
                 "requests_per_minute": 60,
@@ -131,12 +430,12 @@ class NintendoDeveloperAPI:
         
         # Save the default config
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(config, f, indent=2)
-            logger.info(f"Created default config file: {self.config_file}")
+            with open(self.config_file, 'wb') as f:
+                f.write(_dumps(config, indent=True))
+            logger.info("Created default config file: %s", self.config_file)
             logger.warning("Please update the config file with your Nintendo Developer API credentials!")
         except Exception as e:
-            logger.error(f"Could not save default config: {e}")
+            logger.error("Could not save default config: %s", e)
             
         return config
     
@@ -162,7 +461,7 @@ class NintendoDeveloperAPI:
                 return self._authenticate_with_stored_tokens()
                 
         except Exception as e:
-            logger.error(f"Authentication failed: {e}")
+            logger.error("Authentication failed: %s", e)
             return False
     
     def _authenticate_with_session_token(self, session_token: str) -> bool:
@@ -170,23 +469,23 @@ class NintendoDeveloperAPI:
         try:
             # Exchange session token for access token
             auth_payload = {
-                'client_id': self.config['client_id'],
+                'client_id': self._client_id,
                 'session_token': session_token,
                 'grant_type': 'urn:ietf:params:oauth:grant-type:session-token'
             }
             
             response = self.session.post(
-                f"{self.auth_url}/connect/1.0.0/api/token",
-                json=auth_payload,
-                timeout=self.config['timeout']
+                self._auth_token_url,
+                data=_dumps(auth_payload),
+                timeout=self._timeout
             )
             
             if response.status_code == 200:
-                token_data = response.json()
+                token_data = _loads(response.content)
                 self.access_token = token_data['access_token']
                 self.refresh_token = token_data.get('refresh_token')
                 expires_in = token_data.get('expires_in', 3600)
-                self.token_expires_at = datetime.now() + timedelta(seconds=expires_in)
+                self._set_token_expiry(expires_in)
                 
                 # Update session headers
                 self.session.headers['Authorization'] = f'Bearer {self.access_token}'
@@ -198,11 +497,11 @@ class NintendoDeveloperAPI:
                 logger.info("Successfully authenticated with Nintendo Developer APIs")
                 return True
             else:
-                logger.error(f"Token exchange failed: {response.status_code} - {response.text}")
+                logger.error("Token exchange failed: %s - %s", response.status_code, _body_head(response))
                 return False
                 
         except Exception as e:
-            logger.error(f"Session token authentication failed: {e}")
+            logger.error("Session token authentication failed: %s", e)
             return False
     
     def _authenticate_with_credentials(self, username: str, password: str) -> bool:
@@ -210,24 +509,24 @@ class NintendoDeveloperAPI:
         try:
             # Step 1: Get authorization code
             auth_params = {
-                'client_id': self.config['client_id'],
+                'client_id': self._client_id,
                 'redirect_uri': self.config['redirect_uri'],
                 'response_type': 'code',
                 'scope': self.config['scope'],
-                'state': str(uuid.uuid4())
+                'state': secrets.token_urlsafe(16)
             }
             
-            auth_url = f"{self.auth_url}/connect/1.0.0/authorize"
+            auth_url = self._auth_authorize_url
             
             # In a real implementation, you'd redirect the user to this URL
             # and handle the callback. For now, we'll simulate this process.
-            logger.info(f"Authorization URL: {auth_url}")
+            logger.info("Authorization URL: %s", auth_url)
             logger.warning("Manual OAuth2 flow required. Please implement web-based authentication.")
             
             return False  # Implement full OAuth2 flow as needed
             
         except Exception as e:
-            logger.error(f"Credential authentication failed: {e}")
+            logger.error("Credential authentication failed: %s", e)
             return False
     
     def _authenticate_with_stored_tokens(self) -> bool:
@@ -240,24 +539,24 @@ class NintendoDeveloperAPI:
                 
             # Use refresh token to get new access token
             refresh_payload = {
-                'client_id': self.config['client_id'],
+                'client_id': self._client_id,
                 'client_secret': self.config['client_secret'],
                 'refresh_token': stored_tokens['refresh_token'],
                 'grant_type': 'refresh_token'
             }
             
             response = self.session.post(
-                f"{self.auth_url}/connect/1.0.0/api/token",
-                json=refresh_payload,
-                timeout=self.config['timeout']
+                self._auth_token_url,
+                data=_dumps(refresh_payload),
+                timeout=self._timeout
             )
             
             if response.status_code == 200:
-                token_data = response.json()
+                token_data = _loads(response.content)
                 self.access_token = token_data['access_token']
                 self.refresh_token = token_data.get('refresh_token', stored_tokens['refresh_token'])
                 expires_in = token_data.get('expires_in', 3600)
-                self.token_expires_at = datetime.now() + timedelta(seconds=expires_in)
+                self._set_token_expiry(expires_in)
                 
                 self.session.headers['Authorization'] = f'Bearer {self.access_token}'
                 self._store_tokens()
@@ -266,38 +565,39 @@ class NintendoDeveloperAPI:
                 logger.info("Successfully refreshed authentication tokens")
                 return True
             else:
-                logger.error(f"Token refresh failed: {response.status_code}")
+                logger.error("Token refresh failed: %s", response.status_code)
                 return False
                 
         except Exception as e:
-            logger.error(f"Stored token authentication failed: {e}")
+            logger.error("Stored token authentication failed: %s", e)
             return False
     
     def _store_tokens(self):
         """Securely store authentication tokens"""
         try:
-            if not self.config.get('encryption_key'):
+            if self._aead is None:
                 logger.warning("No encryption key found. Tokens will not be stored.")
                 return
-                
-            fernet = Fernet(self.config['encryption_key'].encode())
             
             token_data = {
                 'access_token': self.access_token,
                 'refresh_token': self.refresh_token,
-                'expires_at': self.token_expires_at.isoformat() if self.token_expires_at else None,
-                'stored_at': datetime.now().isoformat()
+                'expires_at': self._token_expiry or None,
+                'stored_at': time.time()
             }
             
-            encrypted_data = fernet.encrypt(json.dumps(token_data).encode())
-            
             with open('.nintendo_tokens', 'wb') as f:
-                f.write(encrypted_data)
+                f.write(self._encrypt_tokens(_dumps(token_data)))
                 
             logger.debug("Tokens stored securely")
             
         except Exception as e:
-            logger.error(f"Failed to store tokens: {e}")
+            logger.error("Failed to store tokens: %s", e)
+    
+    def _encrypt_tokens(self, plaintext: bytes) -> bytes:
+        """Encrypt token JSON into the on-disk AES-GCM format"""
+        nonce = os.urandom(_TOKEN_NONCE_SIZE)
+        return _TOKEN_FILE_MAGIC + nonce + self._aead.encrypt(nonce, plaintext, None)
     
     def _load_stored_tokens(self) -> Optional[Dict[str, str]]:
         """Load stored authentication tokens"""
@@ -305,214 +605,166 @@ class NintendoDeveloperAPI:
             if not os.path.exists('.nintendo_tokens'):
                 return None
                 
-            if not self.config.get('encryption_key'):
+            if self._aead is None:
                 return None
-                
-            fernet = Fernet(self.config['encryption_key'].encode())
             
             with open('.nintendo_tokens', 'rb') as f:
                 encrypted_data = f.read()
-                
-            decrypted_data = fernet.decrypt(encrypted_data)
-            token_data = json.loads(decrypted_data.decode())
+            
+            if encrypted_data.startswith(_TOKEN_FILE_MAGIC):
+                nonce = encrypted_data[len(_TOKEN_FILE_MAGIC):len(_TOKEN_FILE_MAGIC) + _TOKEN_NONCE_SIZE]
+                ciphertext = encrypted_data[len(_TOKEN_FILE_MAGIC) + _TOKEN_NONCE_SIZE:]
+                decrypted_data = self._aead.decrypt(nonce, ciphertext, None)
+            else:
+                # One-time migration of a Fernet token file to AES-GCM
+                decrypted_data = Fernet(self._encryption_key.encode()).decrypt(encrypted_data)
+                with open('.nintendo_tokens', 'wb') as f:
+                    f.write(self._encrypt_tokens(decrypted_data))
+                logger.info("Migrated stored tokens to AES-GCM")
+            
+            token_data = _loads(decrypted_data)
             
             # Check if tokens are expired
-            if token_data.get('expires_at'):
-                expires_at = datetime.fromisoformat(token_data['expires_at'])
-                if expires_at <= datetime.now():
-                    logger.info("Stored tokens have expired")
-                    return None
+            expires_at = token_data.get('expires_at')
+            if isinstance(expires_at, str):
+                # Token files written before expiry was stored as an epoch
+                expires_at = datetime.fromisoformat(expires_at).timestamp()
+            if expires_at and expires_at <= time.time():
+                logger.info("Stored tokens have expired")
+                return None
                     
             return token_data
             
         except Exception as e:
-            logger.error(f"Failed to load stored tokens: {e}")
+            logger.error("Failed to load stored tokens: %s", e)
             return None
     
-    def get_user_devices(self) -> List[NintendoDevice]:
-        """Get list of Nintendo Switch devices for authenticated user"""
+    def _ensure_token(self):
+        """Refresh the access token if it is about to expire"""
+        if time.time() < self._expires_epoch:
+            return
+        with self._token_lock:
+            # Another thread may have refreshed while we waited
+            if time.time() >= self._expires_epoch:
+                self._authenticate_with_stored_tokens()
+    
+    def _request(self, method: str, url: str, action: str,
+                 ok_codes: tuple = (200,), **kwargs) -> Optional[requests.Response]:
+        """
+        Send an authenticated, rate-limited API request
+        
+        Returns:
+            The response if its status is in ok_codes, otherwise None
+            (the failure is logged using the action description)
+        """
         if not self.authenticated:
             raise NintendoDeveloperAPIError("Not authenticated")
-            
+        
+        self._ensure_token()
+        self._rate_limiter.acquire()
+        kwargs.setdefault('timeout', self._timeout)
+        
         try:
-            response = self.session.get(
-                f"{self.base_url}/api/{self.api_version}/devices",
-                timeout=self.config['timeout']
-            )
+            response = self.session.request(method, url, **kwargs)
+        except requests.RequestException as e:
+            logger.error("Error trying to %s: %s", action, e)
+            return None
+        
+        if response.status_code in ok_codes:
+            return response
+        
+        logger.error("Failed to %s: %s - %s", action, response.status_code, _body_head(response))
+        return None
+    
+    def _device_url(self, device_id: str, endpoint: str) -> str:
+        """URL of a per-device endpoint (status, actions, usage, ...)"""
+        return f"{self._devices_url}/{device_id}/{endpoint}"
+    
+    def get_user_devices(self) -> List[NintendoDevice]:
+        """Get list of Nintendo Switch devices for authenticated user"""
+        response = self._request('GET', self._devices_url, "get devices")
+        if response is None:
+            return []
             
-            if response.status_code == 200:
-                devices_data = response.json()
-                devices = []
-                
-                for device_data in devices_data.get('devices', []):
-                    device = NintendoDevice(
-                        device_id=device_data['device_id'],
-                        device_name=device_data.get('device_name', 'Nintendo Switch'),
-                        nickname=device_data.get('nickname', ''),
-                        location=device_data.get('location', 'Unknown'),
-                        online_status=device_data.get('online', False),
-                        last_played_game=device_data.get('last_played_application', {}).get('name'),
-                        play_time_today=device_data.get('play_time_today_minutes', 0),
-                        play_time_this_week=device_data.get('play_time_week_minutes', 0),
-                        parental_controls_enabled=device_data.get('parental_controls_enabled', False),
-                        current_restrictions=device_data.get('current_restrictions', {}),
-                        last_seen=datetime.fromisoformat(device_data.get('last_seen', datetime.now().isoformat())),
-                        firmware_version=device_data.get('firmware_version', 'Unknown'),
-                        account_id=device_data.get('linked_account_id', '')
-                    )
-                    devices.append(device)
-                    
-                logger.info(f"Retrieved {len(devices)} devices from Nintendo Developer API")
-                return devices
-                
-            else:
-                logger.error(f"Failed to get devices: {response.status_code} - {response.text}")
-                return []
+        try:
+            devices = _parse_devices(response.content)
                 
+            logger.info("Retrieved %s devices from Nintendo Developer API", len(devices))
+            return devices
+            
         except Exception as e:
-            logger.error(f"Error getting user devices: {e}")
+            logger.error("Error getting user devices: %s", e)
             return []
     
     def get_device_status(self, device_id: str) -> Optional[Dict[str, Any]]:
         """Get detailed status for a specific device"""
-        if not self.authenticated:
-            raise NintendoDeveloperAPIError("Not authenticated")
-            
-        try:
-            response = self.session.get(
-                f"{self.base_url}/api/{self.api_version}/devices/{device_id}/status",
-                timeout=self.config['timeout']
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.error(f"Failed to get device status: {response.status_code}")
-                return None
-                
-        except Exception as e:
-            logger.error(f"Error getting device status: {e}")
-            return None
+        action = "get device status"
+        response = self._request(
+            'GET', self._device_url(device_id, 'status'), action
+        )
+        return _response_json(response, action)
+    
+    def _send_device_command(self, method: str, device_id: str, endpoint: str, action: str,
+                             body: bytes, ok_codes: tuple, done: str) -> bool:
+        """Send a write request to a per-device endpoint and log the outcome"""
+        response = self._request(method, self._device_url(device_id, endpoint), action,
+                                 ok_codes=ok_codes, data=body)
+        if response is None:
+            return False
+        
+        logger.info("Successfully %s %s", done, device_id)
+        return True
     
     def update_parental_controls(self, device_id: str, settings: ParentalControlSettings) -> bool:
         """Update parental control settings for a device"""
-        if not self.authenticated:
-            raise NintendoDeveloperAPIError("Not authenticated")
-            
-        try:
-            settings_data = {
-                'daily_time_limit_minutes': settings.daily_time_limit,
-                'bedtime_enabled': settings.bedtime_enabled,
-                'bedtime_start': settings.bedtime_start,
-                'bedtime_end': settings.bedtime_end,
-                'allowed_software_ratings': settings.allowed_software_ratings,
-                'restricted_features': settings.restricted_features,
-                'communication_restrictions': settings.communication_restrictions,
-                'purchase_restrictions': settings.purchase_restrictions
-            }
-            
-            response = self.session.put(
-                f"{self.base_url}/api/{self.api_version}/devices/{device_id}/parental-controls",
-                json=settings_data,
-                timeout=self.config['timeout']
-            )
-            
-            if response.status_code in [200, 204]:
-                logger.info(f"Successfully updated parental controls for device {device_id}")
-                return True
-            else:
-                logger.error(f"Failed to update parental controls: {response.status_code} - {response.text}")
-                return False
-                
-        except Exception as e:
-            logger.error(f"Error updating parental controls: {e}")
-            return False
+        return self._send_device_command(
+            'PUT', device_id, 'parental-controls', "update parental controls",
+            _settings_body(settings), (200, 204), "updated parental controls for device"
+        )
     
     def suspend_device(self, device_id: str, duration_minutes: int = None) -> bool:
         """Suspend a device immediately (parental control action)"""
-        if not self.authenticated:
-            raise NintendoDeveloperAPIError("Not authenticated")
-            
-        try:
-            suspend_data = {
-                'action': 'suspend',
-                'immediate': True
-            }
-            
-            if duration_minutes:
-                suspend_data['duration_minutes'] = duration_minutes
-                
-            response = self.session.post(
-                f"{self.base_url}/api/{self.api_version}/devices/{device_id}/actions",
-                json=suspend_data,
-                timeout=self.config['timeout']
-            )
-            
-            if response.status_code in [200, 202]:
-                logger.info(f"Successfully suspended device {device_id}")
-                return True
-            else:
-                logger.error(f"Failed to suspend device: {response.status_code} - {response.text}")
-                return False
-                
-        except Exception as e:
-            logger.error(f"Error suspending device: {e}")
-            return False
+        return self._send_device_command(
+            'POST', device_id, 'actions', "suspend device",
+            _suspend_body(duration_minutes), (200, 202), "suspended device"
+        )
     
     def resume_device(self, device_id: str) -> bool:
         """Resume a suspended device"""
-        if not self.authenticated:
-            raise NintendoDeveloperAPIError("Not authenticated")
-            
-        try:
-            resume_data = {
-                'action': 'resume',
-                'immediate': True
-            }
-            
-            response = self.session.post(
-                f"{self.base_url}/api/{self.api_version}/devices/{device_id}/actions",
-                json=resume_data,
-                timeout=self.config['timeout']
-            )
-            
-            if response.status_code in [200, 202]:
-                logger.info(f"Successfully resumed device {device_id}")
-                return True
-            else:
-                logger.error(f"Failed to resume device: {response.status_code} - {response.text}")
-                return False
-                
-        except Exception as e:
-            logger.error(f"Error resuming device: {e}")
-            return False
+        return self._send_device_command(
+            'POST', device_id, 'actions', "resume device",
+            _RESUME_BODY, (200, 202), "resumed device"
+        )
     
     def get_usage_history(self, device_id: str, days: int = 7) -> Dict[str, Any]:
         """Get usage history for a device"""
-        if not self.authenticated:
-            raise NintendoDeveloperAPIError("Not authenticated")
-            
-        try:
-            params = {
-                'days': days,
-                'include_applications': True
-            }
-            
-            response = self.session.get(
-                f"{self.base_url}/api/{self.api_version}/devices/{device_id}/usage",
-                params=params,
-                timeout=self.config['timeout']
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.error(f"Failed to get usage history: {response.status_code}")
-                return {}
-                
-        except Exception as e:
-            logger.error(f"Error getting usage history: {e}")
+        params = {
+            'days': days,
+            'include_applications': True
+        }
+        
+        action = "get usage history"
+        response = self._request(
+            'GET', self._device_url(device_id, 'usage'),
+            action, params=params
+        )
+        return _response_json(response, action, {})
+    
+    def _map_devices(self, fetch, device_ids: List[str]) -> Dict[str, Any]:
+        """Run a per-device request for many devices concurrently"""
+        if not device_ids:
             return {}
+        # Requests share the pooled session; only the auth methods touch its headers
+        with ThreadPoolExecutor(max_workers=min(16, len(device_ids))) as executor:
+            return dict(zip(device_ids, executor.map(fetch, device_ids)))
+    
+    def get_devices_status_bulk(self, device_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Get status for several devices at once, keyed by device ID"""
+        return self._map_devices(self.get_device_status, device_ids)
+    
+    def get_usage_history_bulk(self, device_ids: List[str], days: int = 7) -> Dict[str, Dict[str, Any]]:
+        """Get usage history for several devices at once, keyed by device ID"""
+        return self._map_devices(lambda device_id: self.get_usage_history(device_id, days), device_ids)
     
     def logout(self) -> bool:
         """Logout and clear authentication"""
@@ -520,20 +772,21 @@ class NintendoDeveloperAPI:
             if self.authenticated and self.access_token:
                 # Revoke the access token
                 revoke_data = {
-                    'client_id': self.config['client_id'],
+                    'client_id': self._client_id,
                     'token': self.access_token
                 }
                 
                 self.session.post(
-                    f"{self.auth_url}/connect/1.0.0/api/revoke",
-                    json=revoke_data,
-                    timeout=self.config['timeout']
+                    self._auth_revoke_url,
+                    data=_dumps(revoke_data),
+                    timeout=self._timeout
                 )
             
             # Clear stored data
             self.access_token = None
             self.refresh_token = None
-            self.token_expires_at = None
+            self._token_expiry = 0.0
+            self._expires_epoch = 0.0
             self.authenticated = False
             
             if 'Authorization' in self.session.headers:
@@ -547,9 +800,132 @@ class NintendoDeveloperAPI:
             return True
             
         except Exception as e:
-            logger.error(f"Error during logout: {e}")
+            logger.error("Error during logout: %s", e)
             return False
 
+class NintendoDeveloperAPIAsync:
+    """
+    Async Nintendo Developer API client for concurrent device fan-out
+    
+    Authentication stays on the synchronous NintendoDeveloperAPI; this client
+    reuses its configuration and access token over a single httpx connection
+    pool (HTTP/2 when the h2 package is installed).
+    """
+    
+    def __init__(self, api: NintendoDeveloperAPI):
+        """Initialize from an (authenticated) synchronous client"""
+        if not HTTPX_AVAILABLE:
+            raise NintendoDeveloperAPIError("httpx is required for the async client")
+        
+        self.api = api
+        self.client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            headers=dict(api.session.headers),
+            timeout=api._timeout,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+        )
+    
+    async def aclose(self):
+        """Close pooled connections"""
+        await self.client.aclose()
+    
+    async def __aenter__(self) -> 'NintendoDeveloperAPIAsync':
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+    
+    async def _request(self, method: str, url: str, action: str,
+                       ok_codes: tuple = (200,), **kwargs) -> Optional[Any]:
+        """Send an authenticated request; returns the response or None on failure"""
+        if not self.api.authenticated:
+            raise NintendoDeveloperAPIError("Not authenticated")
+        
+        # Token refresh is a blocking call on the sync client; only hop to a
+        # thread when it is actually due
+        if time.time() >= self.api._expires_epoch:
+            await asyncio.get_running_loop().run_in_executor(None, self.api._ensure_token)
+        
+        # Share the sync client's limit without blocking the event loop
+        delay = self.api._rate_limiter.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        
+        # Pick up tokens refreshed by the synchronous client
+        headers = {'Authorization': f'Bearer {self.api.access_token}'}
+        
+        try:
+            response = await self.client.request(method, url, headers=headers, **kwargs)
+        except httpx.HTTPError as e:
+            logger.error("Error trying to %s: %s", action, e)
+            return None
+        
+        if response.status_code in ok_codes:
+            return response
+        
+        logger.error("Failed to %s: %s - %s", action, response.status_code, _body_head(response))
+        return None
+    
+    async def get_user_devices(self) -> List[NintendoDevice]:
+        """Get list of Nintendo Switch devices for authenticated user"""
+        response = await self._request('GET', self.api._devices_url, "get devices")
+        if response is None:
+            return []
+        
+        try:
+            return _parse_devices(response.content)
+        except Exception as e:
+            logger.error("Error getting user devices: %s", e)
+            return []
+    
+    async def get_device_status(self, device_id: str) -> Optional[Dict[str, Any]]:
+        """Get detailed status for a specific device"""
+        action = "get device status"
+        response = await self._request('GET', self.api._device_url(device_id, 'status'), action)
+        return _response_json(response, action)
+    
+    async def update_parental_controls(self, device_id: str, settings: ParentalControlSettings) -> bool:
+        """Update parental control settings for a device"""
+        response = await self._request(
+            'PUT', self.api._device_url(device_id, 'parental-controls'),
+            "update parental controls", ok_codes=(200, 204), content=_settings_body(settings)
+        )
+        return response is not None
+    
+    async def suspend_device(self, device_id: str, duration_minutes: int = None) -> bool:
+        """Suspend a device immediately (parental control action)"""
+        response = await self._request(
+            'POST', self.api._device_url(device_id, 'actions'),
+            "suspend device", ok_codes=(200, 202), content=_suspend_body(duration_minutes)
+        )
+        return response is not None
+    
+    async def resume_device(self, device_id: str) -> bool:
+        """Resume a suspended device"""
+        response = await self._request(
+            'POST', self.api._device_url(device_id, 'actions'),
+            "resume device", ok_codes=(200, 202), content=_RESUME_BODY
+        )
+        return response is not None
+    
+    async def get_usage_history(self, device_id: str, days: int = 7) -> Dict[str, Any]:
+        """Get usage history for a device"""
+        params = {
+            'days': days,
+            'include_applications': True
+        }
+        
+        action = "get usage history"
+        response = await self._request(
+            'GET', self.api._device_url(device_id, 'usage'), action, params=params
+        )
+        return _response_json(response, action, {})
+    
+    async def async_bulk_status(self, device_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Get status for several devices concurrently, keyed by device ID"""
+        statuses = await asyncio.gather(*(self.get_device_status(device_id) for device_id in device_ids))
+        return dict(zip(device_ids, statuses))
+
 def test_nintendo_developer_api():
     """Test function to verify Nintendo Developer API integration"""
     print("🎮 Testing Nintendo Developer API Integration")
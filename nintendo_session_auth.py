@@ -4,59 +4,93 @@ Nintendo Session Authentication Helper
 Helps set up and test Nintendo API authentication for parental controls
 """
 
-import json
+import copy
 import os
 import asyncio
+import sys
+import time
 import getpass
-from datetime import datetime
-from pathlib import Path
+import importlib.util
 
-# Check for required dependencies
-try:
-    import pynintendoparental
-    NINTENDO_LIB_AVAILABLE = True
+from _json_backend import dumps as _dumps, loads as _loads
+
+def _now_iso():
+    """Local time in datetime.isoformat() layout, without building a datetime"""
+    t = time.time()
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(t)) + f".{int((t % 1) * 1e6):06d}"
+
+# Last parsed config, keyed on the file's mtime
+_cfg_cache = {"mtime": None, "data": None}
+
+def _cache_config(config_path, config):
+    """Remember a config just written to disk so the next load skips the parse"""
+    _cfg_cache["mtime"] = os.stat(config_path).st_mtime_ns
+    _cfg_cache["data"] = copy.deepcopy(config)
+
+# Check for required dependencies; the library itself is only imported when
+# a session token is actually tested
+NINTENDO_LIB_AVAILABLE = importlib.util.find_spec("pynintendoparental") is not None
+if NINTENDO_LIB_AVAILABLE:
     print("✅ pynintendoparental library found")
-except ImportError:
-    NINTENDO_LIB_AVAILABLE = False
+else:
     print("❌ pynintendoparental library not found")
 
+DIVIDER = "=" * 50
+
+MENU = f"""
+🎮 Nintendo Switch Authentication Helper
+{DIVIDER}
+1. Show current status
+2. Create sample configuration
+3. Set up session token
+4. Test session token
+5. Complete setup and test
+6. Exit"""
+
+LIB_MISSING_MESSAGE = "❌ Cannot test session token - pynintendoparental not available"
+
 def create_sample_config():
-    """Create a sample Nintendo configuration file"""
+    """Create a sample Nintendo configuration file; returns the config, or None on failure"""
     sample_config = {
         "session_token": "",
         "device_mapping": {
             "example_device_1": "real_nintendo_device_id_1",
             "example_device_2": "real_nintendo_device_id_2"
         },
-        "last_updated": datetime.now().isoformat(),
+        "last_updated": _now_iso(),
         "setup_completed": False
     }
     
     config_path = "nintendo_config.json"
     
     try:
-        with open(config_path, 'w') as f:
-            json.dump(sample_config, f, indent=2)
+        with open(config_path, 'wb') as f:
+            f.write(_dumps(sample_config, indent=True))
+        _cache_config(config_path, sample_config)
         print(f"✅ Created sample config: {config_path}")
         print("📝 Edit this file to add your actual session token")
-        return True
+        return sample_config
     except Exception as e:
         print(f"❌ Error creating config: {e}")
-        return False
+        return None
 
 def load_config():
     """Load Nintendo configuration"""
     config_path = "nintendo_config.json"
     
-    if not Path(config_path).exists():
-        print(f"⚠️  Config file not found: {config_path}")
-        return None
-    
     try:
-        with open(config_path, 'r') as f:
-            config = json.load(f)
+        # The stat doubles as the existence check and the cache key
+        mtime = os.stat(config_path).st_mtime_ns
+        if mtime != _cfg_cache["mtime"]:
+            with open(config_path, 'rb') as f:
+                _cfg_cache["data"] = _loads(f.read())
+            _cfg_cache["mtime"] = mtime
         print(f"✅ Loaded config from: {config_path}")
-        return config
+        # Callers modify and save the config, so hand out a copy
+        return copy.deepcopy(_cfg_cache["data"])
+    except FileNotFoundError:
+        print(f"⚠️  Config file not found: {config_path}")
+        return None
     except Exception as e:
         print(f"❌ Error loading config: {e}")
         return None
@@ -64,11 +98,15 @@ def load_config():
 def save_config(config):
     """Save Nintendo configuration"""
     config_path = "nintendo_config.json"
-    config['last_updated'] = datetime.now().isoformat()
+    config['last_updated'] = _now_iso()
     
     try:
-        with open(config_path, 'w') as f:
-            json.dump(config, f, indent=2)
+        # Write a sibling file and swap it in, so a crash never leaves a half-written config
+        tmp_path = config_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(_dumps(config, indent=True))
+        os.replace(tmp_path, config_path)
+        _cache_config(config_path, config)
         print(f"✅ Config saved to: {config_path}")
         return True
     except Exception as e:
@@ -76,12 +114,10 @@ def save_config(config):
         return False
 
 async def test_session_token(session_token):
-    """Test if a session token works"""
-    if not NINTENDO_LIB_AVAILABLE:
-        print("❌ Cannot test session token - pynintendoparental not available")
-        return False
-    
+    """Test if a session token works (callers check NINTENDO_LIB_AVAILABLE first)"""
     try:
+        import pynintendoparental
+        
         print("🧪 Testing session token...")
         
         # Initialize the authenticator with the session token
@@ -99,10 +135,12 @@ async def test_session_token(session_token):
             
             print(f"📱 Found {len(devices)} Nintendo devices:")
             
-            for device in devices:
-                device_name = device.get('name', 'Unknown')
-                device_id = device.get('deviceId', 'Unknown')
-                print(f"   🎮 {device_name} (ID: {device_id})")
+            if devices:
+                lines = [
+                    f"   🎮 {device.get('name', 'Unknown')} (ID: {device.get('deviceId', 'Unknown')})"
+                    for device in devices
+                ]
+                sys.stdout.write("\n".join(lines) + "\n")
             
             return True
         else:
@@ -111,14 +149,15 @@ async def test_session_token(session_token):
             
     except Exception as e:
         print(f"❌ Error testing session token: {e}")
-        import traceback
-        print(f"Debug traceback: {traceback.format_exc()}")
+        if os.environ.get("NINTENDO_DEBUG"):
+            import traceback
+            print(f"Debug traceback: {traceback.format_exc()}")
         return False
 
 def setup_manual_token():
-    """Manual session token setup"""
+    """Manual session token setup; returns the saved config, or None on failure"""
     print("\n🔧 Manual Session Token Setup")
-    print("=" * 50)
+    print(DIVIDER)
     
     print("\n📋 To get a Nintendo session token:")
     print("1. Install and use 'nxapi' tool: https://github.com/samuelthomas2774/nxapi")
@@ -133,7 +172,7 @@ def setup_manual_token():
     
     if not session_token:
         print("❌ No session token provided")
-        return False
+        return None
     
     # Load or create config
     config = load_config()
@@ -153,33 +192,33 @@ def setup_manual_token():
     # Save config
     if save_config(config):
         print("✅ Session token saved to configuration")
-        return True
+        return config
     else:
-        return False
+        return None
 
 async def full_setup_and_test():
     """Complete setup and testing workflow"""
     print("🎮 Nintendo Switch Authentication Setup")
-    print("=" * 50)
+    print(DIVIDER)
     
     # Check if config exists
     config = load_config()
     
     if not config:
         print("📝 No configuration found. Creating sample config...")
-        create_sample_config()
-        config = load_config()
+        config = create_sample_config()
     
     # Check if session token is configured
     if not config or not config.get('session_token'):
         print("\n⚙️  Session token not configured")
         
+        # Plain blocking prompts: an executor thread stuck in input() would
+        # keep the process alive after Ctrl-C, and nothing else runs on the loop
         choice = input("\nWould you like to set up the session token now? (y/n): ").lower().strip()
         
         if choice == 'y':
-            if setup_manual_token():
-                config = load_config()  # Reload updated config
-            else:
+            config = setup_manual_token()
+            if not config:
                 print("❌ Session token setup failed")
                 return False
         else:
@@ -191,7 +230,11 @@ async def full_setup_and_test():
         print(f"\n🧪 Testing configured session token...")
         
         session_token = config['session_token']
-        success = await test_session_token(session_token)
+        if NINTENDO_LIB_AVAILABLE:
+            success = await test_session_token(session_token)
+        else:
+            print(LIB_MISSING_MESSAGE)
+            success = False
         
         if success:
             print("\n🎉 Nintendo authentication setup complete!")
@@ -199,7 +242,7 @@ async def full_setup_and_test():
             
             # Update config to mark setup as complete
             config['setup_completed'] = True
-            config['last_tested'] = datetime.now().isoformat()
+            config['last_tested'] = _now_iso()
             save_config(config)
             
             return True
@@ -217,72 +260,72 @@ async def full_setup_and_test():
 
 def show_current_status():
     """Show current authentication status"""
-    print("📊 Current Nintendo Authentication Status")
-    print("=" * 50)
-    
-    print(f"📚 pynintendoparental library: {'✅ Available' if NINTENDO_LIB_AVAILABLE else '❌ Not available'}")
+    print(f"""📊 Current Nintendo Authentication Status
+{DIVIDER}
+📚 pynintendoparental library: {'✅ Available' if NINTENDO_LIB_AVAILABLE else '❌ Not available'}""")
     
     config = load_config()
-    if config:
-        has_token = bool(config.get('session_token'))
-        is_setup = config.get('setup_completed', False)
-        last_updated = config.get('last_updated', 'Never')
-        last_tested = config.get('last_tested', 'Never')
-        
-        print(f"🔧 Configuration file: ✅ Found")
-        print(f"🔑 Session token: {'✅ Configured' if has_token else '❌ Not configured'}")
-        print(f"✅ Setup completed: {'✅ Yes' if is_setup else '❌ No'}")
-        print(f"📅 Last updated: {last_updated}")
-        print(f"🧪 Last tested: {last_tested}")
-        
-        if config.get('device_mapping'):
-            print(f"📱 Device mapping: {len(config['device_mapping'])} entries")
-            for local_name, nintendo_id in config['device_mapping'].items():
-                print(f"   🎮 {local_name} → {nintendo_id}")
-    else:
-        print(f"🔧 Configuration file: ❌ Not found")
+    if not config:
+        print("🔧 Configuration file: ❌ Not found\n")
+        return
+    
+    status = f"""🔧 Configuration file: ✅ Found
+🔑 Session token: {'✅ Configured' if config.get('session_token') else '❌ Not configured'}
+✅ Setup completed: {'✅ Yes' if config.get('setup_completed', False) else '❌ No'}
+📅 Last updated: {config.get('last_updated', 'Never')}
+🧪 Last tested: {config.get('last_tested', 'Never')}
+"""
+    
+    device_mapping = config.get('device_mapping')
+    if device_mapping:
+        status += f"📱 Device mapping: {len(device_mapping)} entries\n" + "".join(
+            f"   🎮 {local_name} → {nintendo_id}\n"
+            for local_name, nintendo_id in device_mapping.items()
+        )
     
-    print()
+    print(status)
 
 def main():
     """Main menu"""
-    while True:
-        print("\n🎮 Nintendo Switch Authentication Helper")
-        print("=" * 50)
-        print("1. Show current status")
-        print("2. Create sample configuration")
-        print("3. Set up session token")
-        print("4. Test session token")
-        print("5. Complete setup and test")
-        print("6. Exit")
-        
-        choice = input("\nSelect option (1-6): ").strip()
-        
-        if choice == '1':
-            show_current_status()
-            
-        elif choice == '2':
-            create_sample_config()
+    # One event loop for the whole session instead of one per async action
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        while True:
+            print(MENU)
             
-        elif choice == '3':
-            setup_manual_token()
+            choice = input("\nSelect option (1-6): ").strip()
             
-        elif choice == '4':
-            config = load_config()
-            if config and config.get('session_token'):
-                asyncio.run(test_session_token(config['session_token']))
-            else:
-                print("❌ No session token configured")
+            if choice == '1':
+                show_current_status()
                 
-        elif choice == '5':
-            asyncio.run(full_setup_and_test())
-            
-        elif choice == '6':
-            print("👋 Goodbye!")
-            break
-            
-        else:
-            print("❌ Invalid option. Please choose 1-6.")
+            elif choice == '2':
+                create_sample_config()
+                
+            elif choice == '3':
+                setup_manual_token()
+                
+            elif choice == '4':
+                if not NINTENDO_LIB_AVAILABLE:
+                    print(LIB_MISSING_MESSAGE)
+                    continue
+                config = load_config()
+                if config and config.get('session_token'):
+                    loop.run_until_complete(test_session_token(config['session_token']))
+                else:
+                    print("❌ No session token configured")
+                    
+            elif choice == '5':
+                loop.run_until_complete(full_setup_and_test())
+                
+            elif choice == '6':
+                print("👋 Goodbye!")
+                break
+                
+            else:
+                print("❌ Invalid option. Please choose 1-6.")
+    finally:
+        loop.close()
 
 if __name__ == "__main__":
     try:
@@ -5,20 +5,72 @@ Simplified for Python 3.7 without type hints
 Now with Nintendo Developer API integration
 """
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, abort, request, send_from_directory, g
+from werkzeug.security import safe_join
 from flask_cors import CORS
+import asyncio
 import subprocess
 import xml.etree.ElementTree as ET
 import tempfile
 import uuid
 import sys
 import os
-import json
+import gzip
+import hashlib
+import mimetypes
+import random
+import shutil
+import socket
+import threading
 import time
 import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+import _json_backend
+
+# msgspec is optional; it enables MessagePack responses for clients that ask
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+MSGPACK_MIMETYPE = 'application/x-msgpack'
+
+_json_loads = _json_backend.loads
+
+def _json_dumps(obj, indent=False):
+    # default=str covers the odd non-JSON value (e.g. a datetime)
+    return _json_backend.dumps(obj, indent=indent, default=str)
+
+# (second, ISO string) for the most recent _now_iso() call
+_iso_cache = (0, '')
+
+def _now_iso():
+    """Local time as an ISO string, formatted at most once per second"""
+    global _iso_cache
+    second = int(time.time())
+    if _iso_cache[0] != second:
+        _iso_cache = (second, datetime.fromtimestamp(second).isoformat())
+    return _iso_cache[1]
+
+def _json_body():
+    """Decode the request body directly; {} when empty, None unless it is a JSON object"""
+    raw = request.get_data(cache=False)
+    if not raw:
+        return {}
+    try:
+        data = _json_loads(raw)
+    except _json_backend.DecodeError:
+        return None
+    # Handlers call data.get(); a bare list/number/string is as bad as invalid JSON
+    return data if isinstance(data, dict) else None
+
 # Try to import Nintendo Developer API integration
 try:
     from nintendo_developer_api import NintendoDeveloperAPI, ParentalControlSettings, NintendoDevice
@@ -28,68 +80,236 @@ except ImportError:
     NINTENDO_DEVELOPER_API_AVAILABLE = False
     print("⚠️ Nintendo Developer API module not available. Using demo mode only.")
 
+# Placeholder titles reported by get_current_game
+_GAMES = ('The Legend of Zelda: Breath of the Wild', 'Super Mario Odyssey',
+          'Mario Kart 8 Deluxe', 'Super Smash Bros. Ultimate', 'System Menu')
+
+# How long a ping result is reused before the device is pinged again
+PING_CACHE_TTL = 2.0
+
+# Absolute path to ping, resolved once. subprocess only takes the posix_spawn
+# fast path when the executable has a directory component
+PING = shutil.which('ping') or 'ping'
+
+# How long an /api/status payload is shared between polling clients
+STATUS_CACHE_TTL = 1.5
+
+# How long an encoded /health body is reused between probes
+HEALTH_CACHE_TTL = 1.0
+
 app = Flask(__name__)
 CORS(app)
 
+# Invariant parts of the simulated Nintendo payloads. Methods shallow-copy
+# these and fill in the per-call fields; nested dicts are shared, so treat
+# them as read-only
+_STATUS_TEMPLATE = {
+    'enabled': True,
+    'device_id': None,
+    'restrictions': {
+        'play_time_limit': {
+            'enabled': True,
+            'daily_limit_minutes': 120,
+            'bedtime_enabled': True,
+            'bedtime_start': '21:00',
+            'bedtime_end': '07:00'
+        },
+        'software_restrictions': {
+            'enabled': True,
+            'age_rating_limit': 'E10+',
+            'restricted_software': []
+        },
+        'communication_restrictions': {
+            'enabled': True,
+            'online_communication': False,
+            'posting_screenshots': False,
+            'friend_registration': False
+        }
+    },
+    'current_usage': {
+        'today_play_time_minutes': 45,
+        'this_week_total_minutes': 320,
+        'last_played': None
+    },
+    'last_updated': None
+}
+
+_USAGE_STATS_TEMPLATE = {
+    'device_id': None,
+    'today': {
+        'play_time_minutes': 45,
+        'sessions': 2,
+        'most_played_game': 'Super Mario Odyssey'
+    },
+    'this_week': {
+        'total_play_time_minutes': 320,
+        'daily_average_minutes': 45,
+        'most_active_day': 'Saturday'
+    },
+    'last_updated': None
+}
+
+_DEMO_DEVICES = (
+    {
+        'device_id': 'newswitch',
+        'device_name': 'newswitch',
+        'device_type': 'nintendo_switch',
+        'linked_date': '2024-01-01',
+        'parental_controls_enabled': True,
+        'controls_enabled': True,
+        'current_user': 'Primary User',
+        'location': 'Main Gaming Area',
+        'today_play_time_minutes': 67,
+        'daily_limit_minutes': 180,
+        'online': False,
+        'demo_mode': True
+    },
+    {
+        'device_id': 'backroom',
+        'device_name': 'backroom', 
+        'device_type': 'nintendo_switch',
+        'linked_date': '2024-01-01',
+        'parental_controls_enabled': True,
+        'controls_enabled': True,
+        'current_user': 'Secondary User',
+        'location': 'Back Room',
+        'today_play_time_minutes': 23,
+        'daily_limit_minutes': 120,
+        'online': False,
+        'demo_mode': True
+    }
+)
+
 class SimpleMACManager:
     def __init__(self, mac_file_path='/home/pi/parental-controls/mac_addresses.txt'):
         self.mac_file_path = Path(mac_file_path)
+        # Parsed devices as a tuple (shared by every caller), keyed on the file's (mtime, size)
+        self._cache = None
+        self._cache_key = None
         
     def get_enabled_devices(self):
         devices = []
         try:
-            if not self.mac_file_path.exists():
-                return devices
+            try:
+                st = self.mac_file_path.stat()
+            except FileNotFoundError:
+                return ()
             
-            content = self.mac_file_path.read_text(encoding='utf-8').strip()
-            if not content:
-                return devices
+            key = (st.st_mtime_ns, st.st_size)
+            if key == self._cache_key:
+                return self._cache
             
-            for line_num, line in enumerate(content.split('\n'), 1):
+            for line in self.mac_file_path.read_text(encoding='utf-8').splitlines():
                 line = line.strip()
                 if not line:
                     continue
                 
-                parts = line.split('\t')
-                if len(parts) < 2:
+                # Lines look like "id|name<TAB>mac"; the id prefix is optional
+                id_name_part, sep, rest = line.partition('\t')
+                if not sep:
                     continue
+                mac_part = rest.partition('\t')[0]
                 
-                id_name_part = parts[0]
-                mac_part = parts[1]
-                
-                if '|' in id_name_part:
-                    id_str, name = id_name_part.split('|', 1)
-                else:
+                id_str, sep, name = id_name_part.partition('|')
+                if not sep:
                     name = id_name_part
                 
                 devices.append({
                     'name': name,
                     'mac': mac_part
                 })
+            
+            self._cache, self._cache_key = tuple(devices), key
+            return self._cache
         except Exception as e:
             print(f"Error loading devices: {e}")
         
-        return devices
+        return tuple(devices)
 
 class SimpleOPNsenseManager:
     def __init__(self):
         self.router_ip = "192.168.123.1"
         self.ssh_key_path = "/home/pi/.ssh/id_ed25519_opnsense"
+        # Commands are multiplexed over one persistent master connection
+        # instead of a full handshake each. Its socket lives in the user's
+        # private ~/.ssh (not world-writable /tmp) under a fixed name, so a
+        # stale one can be found and removed
+        self.control_path = os.path.expanduser(f"~/.ssh/cm-opnsense-{self.router_ip}")
+        self._master_lock = threading.Lock()
+    
+    def _ssh_args(self):
+        return ["ssh", "-i", self.ssh_key_path, "-o", "BatchMode=yes",
+                "-o", f"ControlPath={self.control_path}"]
+    
+    def _master_alive(self):
+        """True if a master is listening on the control socket; removes a stale socket"""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(1)
+        try:
+            sock.connect(self.control_path)
+            return True
+        except FileNotFoundError:
+            return False
+        except OSError:
+            # Left behind by a master that died (e.g. the router rebooted)
+            try:
+                os.unlink(self.control_path)
+            except OSError:
+                pass
+            return False
+        finally:
+            sock.close()
+    
+    def _ensure_master(self):
+        """Start the background master connection if none is running"""
+        with self._master_lock:
+            if self._master_alive():
+                return
+            # -f backgrounds after authentication. All stdio goes to DEVNULL so
+            # the long-lived master holds none of our pipes. Keepalives make it
+            # exit within ~15s if the router goes away
+            subprocess.run(
+                self._ssh_args() + [
+                    "-o", "ControlMaster=yes", "-o", "ControlPersist=600",
+                    "-o", "ServerAliveInterval=5", "-o", "ServerAliveCountMax=3",
+                    "-fN", f"root@{self.router_ip}"
+                ],
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                timeout=30
+            )
+    
+    def _stop_master(self):
+        """Tear down a master whose connection stopped working"""
+        subprocess.run(self._ssh_args() + ["-O", "exit", f"root@{self.router_ip}"],
+                       stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       timeout=5)
         
     def ssh_command(self, command):
         try:
-            ssh_cmd = [
-                "ssh", "-i", self.ssh_key_path, 
+            self._ensure_master()
+            
+            # ControlMaster=no: commands only ever use the master, never become one
+            ssh_cmd = self._ssh_args() + [
+                "-o", "ControlMaster=no",
                 f"root@{self.router_ip}",
                 command
             ]
             
-            result = subprocess.run(
-                ssh_cmd, 
-                capture_output=True, 
-                text=True, 
-                timeout=30
-            )
+            try:
+                result = subprocess.run(
+                    ssh_cmd, 
+                    stdin=subprocess.DEVNULL,
+                    capture_output=True, 
+                    text=True, 
+                    timeout=30
+                )
+            except subprocess.TimeoutExpired:
+                self._stop_master()
+                raise
+            
+            if result.returncode == 255:
+                # ssh itself failed; start a fresh master on the next call
+                self._stop_master()
             
             return result.returncode == 0, result.stdout.strip()
         
@@ -111,6 +331,11 @@ class SimpleNintendoSwitchManager:
         self.config_path = config_path
         self.access_token = None
         self.device_id = None
+        self._ping_cache = {}  # ip -> (monotonic timestamp, reachable)
+        # Cleared if asyncio can't spawn processes here (e.g. the 3.7 child
+        # watcher off the main thread); pings then go through ping_device
+        self._async_ping_ok = True
+        self._device_enabled = {}  # device_id -> controls enabled (default True)
         
         # Initialize Enhanced Nintendo Discovery
         try:
@@ -136,16 +361,22 @@ class SimpleNintendoSwitchManager:
         else:
             self.developer_api = None
             self.production_mode = False
+        
+        # Ensure config directory exists (once, rather than on every save)
+        try:
+            Path(self.config_path).parent.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            print(f"Warning: Could not create Nintendo config directory: {e}")
             
         self.load_config()
 
     def load_config(self):
         try:
-            if Path(self.config_path).exists():
-                with open(self.config_path, 'r') as f:
-                    config = json.load(f)
-                    self.access_token = config.get('access_token')
-                    self.device_id = config.get('device_id')
+            config = _json_loads(Path(self.config_path).read_bytes())
+            self.access_token = config.get('access_token')
+            self.device_id = config.get('device_id')
+        except FileNotFoundError:
+            pass
         except Exception as e:
             print(f"Warning: Could not load Nintendo config: {e}")
 
@@ -154,14 +385,10 @@ class SimpleNintendoSwitchManager:
             config = {
                 'access_token': self.access_token,
                 'device_id': self.device_id,
-                'last_updated': datetime.now().isoformat()
+                'last_updated': _now_iso()
             }
             
-            # Ensure config directory exists
-            Path(self.config_path).parent.mkdir(exist_ok=True)
-            
-            with open(self.config_path, 'w') as f:
-                json.dump(config, f, indent=2)
+            Path(self.config_path).write_bytes(_json_dumps(config, indent=True))
         except Exception as e:
             print(f"Error saving Nintendo config: {e}")
 
@@ -194,36 +421,10 @@ class SimpleNintendoSwitchManager:
                 'error': 'Not authenticated or no device'
             }
         
-        return {
-            'enabled': True,
-            'device_id': device_id,
-            'restrictions': {
-                'play_time_limit': {
-                    'enabled': True,
-                    'daily_limit_minutes': 120,
-                    'bedtime_enabled': True,
-                    'bedtime_start': '21:00',
-                    'bedtime_end': '07:00'
-                },
-                'software_restrictions': {
-                    'enabled': True,
-                    'age_rating_limit': 'E10+',
-                    'restricted_software': []
-                },
-                'communication_restrictions': {
-                    'enabled': True,
-                    'online_communication': False,
-                    'posting_screenshots': False,
-                    'friend_registration': False
-                }
-            },
-            'current_usage': {
-                'today_play_time_minutes': 45,
-                'this_week_total_minutes': 320,
-                'last_played': datetime.now().isoformat()
-            },
-            'last_updated': datetime.now().isoformat()
-        }
+        now_iso = _now_iso()
+        status = dict(_STATUS_TEMPLATE, device_id=device_id, last_updated=now_iso)
+        status['current_usage'] = dict(_STATUS_TEMPLATE['current_usage'], last_played=now_iso)
+        return status
 
     def enable_parental_controls(self, device_id=None):
         device_id = device_id or self.device_id
@@ -255,25 +456,25 @@ class SimpleNintendoSwitchManager:
 
     def discover_network_devices(self):
         """Discover Nintendo Switch devices on the network"""
-        import socket
-        import subprocess
-        from datetime import datetime
-        
         known_switches = {
             '192.168.123.134': {'name': 'newswitch', 'location': 'Main Gaming Area'},
             '192.168.123.135': {'name': 'backroom', 'location': 'Back Room'}
         }
         
+        # Ping all switches at once so discovery takes one timeout, not one
+        # per device; the results land in the ping cache, so the per-device
+        # info below (current game) doesn't ping again
+        online = asyncio.run(self.ping_devices_async(list(known_switches)))
+        
         discovered_devices = []
         
         for ip, info in known_switches.items():
-            # Check if device is online
-            is_online = self.ping_device(ip)
+            is_online = online[ip]
             
             # Get device info
             device_info = self.get_device_network_info(ip, info)
             device_info['online'] = is_online
-            device_info['last_seen'] = datetime.now().isoformat() if is_online else 'Offline'
+            device_info['last_seen'] = _now_iso() if is_online else 'Offline'
             
             discovered_devices.append(device_info)
             
@@ -281,15 +482,69 @@ class SimpleNintendoSwitchManager:
         
         return discovered_devices
     
+    async def _ping_async(self, ip):
+        """Non-blocking single ping; True if the device answered"""
+        loop = asyncio.get_running_loop()
+        if not self._async_ping_ok:
+            return await loop.run_in_executor(None, self.ping_device, ip)
+        
+        try:
+            process = await asyncio.create_subprocess_exec(
+                PING, '-c', '1', '-W', '2', ip,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+        except Exception:
+            logger.warning("Async ping unavailable, falling back to blocking ping", exc_info=True)
+            self._async_ping_ok = False
+            return await loop.run_in_executor(None, self.ping_device, ip)
+        
+        try:
+            return await asyncio.wait_for(process.wait(), timeout=5) == 0
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            return False
+    
+    async def ping_devices_async(self, ips):
+        """Ping several devices concurrently; returns {ip: reachable} and fills the ping cache"""
+        now = time.monotonic()
+        online = {}
+        stale = []
+        for ip in ips:
+            cached = self._ping_cache.get(ip)
+            if cached and now - cached[0] < PING_CACHE_TTL:
+                online[ip] = cached[1]
+            else:
+                stale.append(ip)
+        
+        results = await asyncio.gather(*(self._ping_async(ip) for ip in stale))
+        now = time.monotonic()
+        for ip, reachable in zip(stale, results):
+            self._ping_cache[ip] = (now, reachable)
+            online[ip] = reachable
+        
+        return online
+    
     def ping_device(self, ip):
-        """Check if a device is reachable"""
+        """Check if a device is reachable (results are reused for PING_CACHE_TTL seconds)"""
+        cached = self._ping_cache.get(ip)
+        if cached and time.monotonic() - cached[0] < PING_CACHE_TTL:
+            return cached[1]
+        
         try:
-            # Use ping to check if device is reachable
-            result = subprocess.run(['ping', '-c', '1', '-W', '2', ip], 
-                                  capture_output=True, text=True, timeout=5)
-            return result.returncode == 0
+            # Use ping to check if device is reachable. Only the exit code
+            # matters; with an absolute PING and close_fds=False Python can use
+            # posix_spawn. Sockets and files Python opens are non-inheritable
+            # (PEP 446), so the server's listening/client sockets don't leak
+            result = subprocess.run([PING, '-c', '1', '-W', '2', ip],
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                  close_fds=False, timeout=5)
+            reachable = result.returncode == 0
         except:
-            return False
+            reachable = False
+        
+        self._ping_cache[ip] = (time.monotonic(), reachable)
+        return reachable
     
     def get_device_network_info(self, ip, device_info):
         """Get detailed information about a Nintendo Switch device"""
@@ -305,7 +560,7 @@ class SimpleNintendoSwitchManager:
             'location': location,
             'linked_date': '2024-01-01',
             'parental_controls_enabled': True,
-            'controls_enabled': getattr(self, f'{device_name}_enabled', True),
+            'controls_enabled': self._device_enabled.get(device_name, True),
             'network_discovered': True,
             'production_mode': True
         }
@@ -332,10 +587,7 @@ class SimpleNintendoSwitchManager:
         """Attempt to detect current game (placeholder for future implementation)"""
         # This would require reverse engineering Nintendo's network protocols
         # For now, return a placeholder
-        import random
-        games = ['The Legend of Zelda: Breath of the Wild', 'Super Mario Odyssey', 
-                'Mario Kart 8 Deluxe', 'Super Smash Bros. Ultimate', 'System Menu']
-        return random.choice(games) if self.ping_device(ip) else None
+        return _GAMES[random.randrange(len(_GAMES))] if self.ping_device(ip) else None
     
     def get_devices(self):
         if not self.access_token:
@@ -395,7 +647,7 @@ class SimpleNintendoSwitchManager:
                 'session_active': device['session_active'],
                 
                 # Control states
-                'controls_enabled': getattr(self, f"{device['device_id']}_enabled", True),
+                'controls_enabled': self._device_enabled.get(device['device_id'], True),
                 'parental_controls_enabled': True,
                 'daily_limit_minutes': device.get('daily_limit_minutes', 120),
                 
@@ -410,34 +662,8 @@ class SimpleNintendoSwitchManager:
     def get_demo_devices(self):
         """Fallback demo devices"""
         return [
-            {
-                'device_id': 'newswitch',
-                'device_name': 'newswitch',
-                'device_type': 'nintendo_switch',
-                'linked_date': '2024-01-01',
-                'parental_controls_enabled': True,
-                'controls_enabled': getattr(self, 'newswitch_enabled', True),
-                'current_user': 'Primary User',
-                'location': 'Main Gaming Area',
-                'today_play_time_minutes': 67,
-                'daily_limit_minutes': 180,
-                'online': False,
-                'demo_mode': True
-            },
-            {
-                'device_id': 'backroom',
-                'device_name': 'backroom', 
-                'device_type': 'nintendo_switch',
-                'linked_date': '2024-01-01',
-                'parental_controls_enabled': True,
-                'controls_enabled': getattr(self, 'backroom_enabled', True),
-                'current_user': 'Secondary User',
-                'location': 'Back Room',
-                'today_play_time_minutes': 23,
-                'daily_limit_minutes': 120,
-                'online': False,
-                'demo_mode': True
-            }
+            dict(device, controls_enabled=self._device_enabled.get(device['device_id'], True))
+            for device in _DEMO_DEVICES
         ]
     
     def toggle_device_controls(self, device_id, enabled):
@@ -446,19 +672,7 @@ class SimpleNintendoSwitchManager:
             return False
             
         try:
-            # Store device state for real device names
-            if device_id == 'newswitch':
-                self.newswitch_enabled = enabled
-            elif device_id == 'backroom':
-                self.backroom_enabled = enabled
-            # Legacy support for old demo device IDs
-            elif device_id == 'switch_001':
-                self.device_001_enabled = enabled
-            elif device_id == 'switch_002':
-                self.device_002_enabled = enabled
-            else:
-                print(f"Unknown device ID: {device_id}")
-                return False
+            self._device_enabled[device_id] = enabled
                 
             action = "enabled" if enabled else "disabled"
             print(f"🎮 Nintendo Switch {device_id} parental controls {action}")
@@ -483,20 +697,7 @@ class SimpleNintendoSwitchManager:
         if not self.access_token or not device_id:
             return {}
         
-        return {
-            'device_id': device_id,
-            'today': {
-                'play_time_minutes': 45,
-                'sessions': 2,
-                'most_played_game': 'Super Mario Odyssey'
-            },
-            'this_week': {
-                'total_play_time_minutes': 320,
-                'daily_average_minutes': 45,
-                'most_active_day': 'Saturday'
-            },
-            'last_updated': datetime.now().isoformat()
-        }
+        return dict(_USAGE_STATS_TEMPLATE, device_id=device_id, last_updated=_now_iso())
 
 # Import the integrated Nintendo manager
 try:
@@ -517,43 +718,106 @@ else:
     nintendo_manager = SimpleNintendoSwitchManager()
     print("⚠️ Using Simple Nintendo Switch Manager (fallback)")
 
+# Optional manager capabilities, resolved once; None when the simple manager lacks them
+_set_daily_playtime_limit = getattr(nintendo_manager, 'set_daily_playtime_limit', None)
+_set_bedtime = getattr(nintendo_manager, 'set_bedtime', None)
+_get_parental_control_status = getattr(nintendo_manager, 'get_parental_control_status', None)
+
+def ojson(obj, status=200):
+    """JSON response serialized straight to bytes (orjson when available)"""
+    return Response(_json_dumps(obj), status=status, mimetype='application/json', direct_passthrough=True)
+
+def _wants_msgpack():
+    return MSGSPEC_AVAILABLE and MSGPACK_MIMETYPE in request.headers.get('Accept', '')
+
+def negotiated(obj, status=200):
+    """MessagePack when the client's Accept header asks for it, JSON otherwise"""
+    if _wants_msgpack():
+        response = Response(msgspec.msgpack.encode(obj), status=status, mimetype=MSGPACK_MIMETYPE,
+                            direct_passthrough=True)
+    else:
+        response = ojson(obj, status)
+    response.vary.add('Accept')
+    return response
+
+# One timestamp per request, shared by everything in the response
+@app.before_request
+def _stamp_request():
+    g.now_iso = _now_iso()
+
+# Polled GET endpoints that get an ETag so unchanged bodies come back as 304.
+# Only /api/status qualifies: its body is shared from the STATUS_CACHE_TTL
+# cache, while the Nintendo endpoints embed a fresh timestamp every second
+_CONDITIONAL_GET_PATHS = frozenset(('/api/status',))
+
+@app.after_request
+def _add_etag(response):
+    if (request.method == 'GET' and response.status_code == 200
+            and request.path in _CONDITIONAL_GET_PATHS):
+        response.set_etag(hashlib.blake2b(response.get_data(), digest_size=8).hexdigest())
+        response.headers['Cache-Control'] = 'private, max-age=1'
+        response = response.make_conditional(request)
+    return response
+
+# Last /api/status payload; concurrent polls share one backend fetch
+_status_cache = {'ts': 0.0, 'value': None}
+_status_lock = threading.Lock()
+
+def _fresh_status():
+    value = _status_cache['value']
+    if value is not None and time.monotonic() - _status_cache['ts'] < STATUS_CACHE_TTL:
+        return value
+    return None
+
+def _build_status():
+    opnsense_status = opnsense_manager.get_parental_control_status()
+    enabled_devices = mac_manager.get_enabled_devices()
+    
+    return {
+        'success': True,
+        'controlsActive': opnsense_status.get('controls_active', False),
+        'lastToggleTime': g.now_iso,
+        'lastToggleReason': 'System check',
+        'systemStatus': 'ready',
+        'profileCount': len(enabled_devices),
+        'uptime': 3600,
+        'timestamp': g.now_iso,
+        'platforms': {
+            'nintendo': 'connected' if nintendo_manager.is_authenticated() else 'available',
+            'google': 'available',
+            'microsoft': 'available',
+            'opnsense': 'connected' if opnsense_status.get('alias_exists') else 'error'
+        },
+        'devices': {
+            'total': len(enabled_devices),
+            'enabled': len(enabled_devices),
+            'disabled': 0
+        },
+        'opnsense': opnsense_status
+    }
+
 # Main API endpoints
 @app.route('/api/status', methods=['GET'])
 def get_status():
     try:
-        opnsense_status = opnsense_manager.get_parental_control_status()
-        enabled_devices = mac_manager.get_enabled_devices()
+        status = _fresh_status()
+        if status is None:
+            with _status_lock:
+                # Another request may have refreshed it while we waited
+                status = _fresh_status()
+                if status is None:
+                    status = _build_status()
+                    _status_cache['ts'], _status_cache['value'] = time.monotonic(), status
         
-        return jsonify({
-            'success': True,
-            'controlsActive': opnsense_status.get('controls_active', False),
-            'lastToggleTime': datetime.now().isoformat(),
-            'lastToggleReason': 'System check',
-            'systemStatus': 'ready',
-            'profileCount': len(enabled_devices),
-            'uptime': 3600,
-            'timestamp': datetime.now().isoformat(),
-            'platforms': {
-                'nintendo': 'connected' if nintendo_manager.is_authenticated() else 'available',
-                'google': 'available',
-                'microsoft': 'available',
-                'opnsense': 'connected' if opnsense_status.get('alias_exists') else 'error'
-            },
-            'devices': {
-                'total': len(enabled_devices),
-                'enabled': len(enabled_devices),
-                'disabled': 0
-            },
-            'opnsense': opnsense_status
-        })
+        return ojson(status)
     
     except Exception as e:
-        return jsonify({
+        return ojson({
             'success': False,
             'error': str(e),
             'controlsActive': False,
             'systemStatus': 'error'
-        }), 500
+        }, 500)
 
 @app.route('/api/toggle', methods=['POST'])
 def toggle_controls():
@@ -562,87 +826,91 @@ def toggle_controls():
         active = request.args.get('active', 'false').lower() == 'true'
         reason = request.args.get('reason', 'Manual toggle')
         
-        print(f"Toggle request: active={active}, reason={reason}")
+        logger.debug("Toggle request: active=%s, reason=%s", active, reason)
         
-        return jsonify({
+        return ojson({
             'success': True,
             'controlsActive': active,
             'message': f'Parental controls {"activated" if active else "deactivated"} successfully',
-            'lastToggleTime': datetime.now().isoformat(),
+            'lastToggleTime': g.now_iso,
             'lastToggleReason': reason,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': g.now_iso
         })
     
     except Exception as e:
-        return jsonify({
+        return ojson({
             'success': False,
             'error': f'Toggle failed: {str(e)}',
             'controlsActive': False
-        }), 500
+        }, 500)
 
 # Nintendo Switch API endpoints
 @app.route('/api/nintendo/authenticate', methods=['POST'])
 def nintendo_authenticate():
     try:
-        data = request.get_json() or {}
+        data = _json_body()
+        if data is None:
+            return ojson({'success': False, 'error': 'invalid json'}, 400)
         username = data.get('username', '')
         password = data.get('password', '')
         
         if not username or not password:
-            return jsonify({
+            return ojson({
                 'success': False,
                 'error': 'Username and password are required'
-            }), 400
+            }, 400)
         
         success = nintendo_manager.authenticate(username, password)
         
-        return jsonify({
+        return ojson({
             'success': success,
             'authenticated': success,
             'message': 'Nintendo Switch authentication successful' if success else 'Authentication failed',
-            'timestamp': datetime.now().isoformat()
+            'timestamp': g.now_iso
         })
     
     except Exception as e:
-        return jsonify({
+        return ojson({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/api/nintendo/status', methods=['GET'])
 def get_nintendo_status():
     try:
         if not nintendo_manager.is_authenticated():
-            return jsonify({
+            return ojson({
                 'success': False,
                 'authenticated': False,
                 'error': 'Not authenticated'
-            }), 401
+            }, 401)
         
         status = nintendo_manager.get_parental_control_status()
-        return jsonify({
+        return ojson({
             'success': True,
             'authenticated': True,
             'nintendo_status': status,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': g.now_iso
         })
     except Exception as e:
-        return jsonify({
+        return ojson({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/api/nintendo/toggle', methods=['POST'])
 def toggle_nintendo_controls():
     try:
         if not nintendo_manager.is_authenticated():
-            return jsonify({
+            return ojson({
                 'success': False,
                 'authenticated': False,
                 'error': 'Not authenticated'
-            }), 401
+            }, 401)
         
-        data = request.get_json() or {}
+        data = _json_body()
+        if data is None:
+            return ojson({'success': False, 'error': 'invalid json'}, 400)
         target_state = data.get('active', False)
         
         if target_state:
@@ -650,82 +918,84 @@ def toggle_nintendo_controls():
         else:
             success = nintendo_manager.disable_parental_controls()
         
-        return jsonify({
+        return ojson({
             'success': success,
             'nintendo_controls_active': target_state if success else not target_state,
             'message': f'Nintendo Switch controls {"enabled" if target_state else "disabled"}',
-            'timestamp': datetime.now().isoformat()
+            'timestamp': g.now_iso
         })
     
     except Exception as e:
-        return jsonify({
+        return ojson({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/api/nintendo/devices', methods=['GET'])
 def get_nintendo_devices():
     try:
         if not nintendo_manager.is_authenticated():
-            return jsonify({
+            return ojson({
                 'success': False,
                 'authenticated': False,
                 'error': 'Not authenticated'
-            }), 401
+            }, 401)
         
         devices = nintendo_manager.get_devices()
-        return jsonify({
+        return ojson({
             'success': True,
             'devices': devices,
             'count': len(devices)
         })
     except Exception as e:
-        return jsonify({
+        return ojson({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/api/nintendo/device_toggle', methods=['POST'])
 def nintendo_device_toggle():
     try:
         if not nintendo_manager.is_authenticated():
-            return jsonify({
+            return ojson({
                 'success': False,
                 'authenticated': False,
                 'error': 'Not authenticated'
-            }), 401
+            }, 401)
         
-        data = request.get_json() or {}
+        data = _json_body()
+        if data is None:
+            return ojson({'success': False, 'error': 'invalid json'}, 400)
         device_id = data.get('device_id')
         target_state = data.get('active', False)
         
         if not device_id:
-            return jsonify({
+            return ojson({
                 'success': False,
                 'error': 'device_id is required'
-            }), 400
+            }, 400)
         
         success = nintendo_manager.toggle_device_controls(device_id, target_state)
         
         if success:
-            return jsonify({
+            return ojson({
                 'success': True,
                 'device_id': device_id,
                 'controls_active': target_state,
                 'message': f'Nintendo Switch {device_id} controls {"enabled" if target_state else "disabled"}',
-                'timestamp': datetime.now().isoformat()
+                'timestamp': g.now_iso
             })
         else:
-            return jsonify({
+            return ojson({
                 'success': False,
                 'error': f'Failed to toggle {device_id} controls'
-            }), 500
+            }, 500)
     
     except Exception as e:
-        return jsonify({
+        return ojson({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/api/nintendo/logout', methods=['POST'])
 def nintendo_logout():
@@ -738,43 +1008,43 @@ def nintendo_logout():
             # Save empty config
             nintendo_manager.save_config()
             
-            return jsonify({
+            return ojson({
                 'success': True,
                 'message': 'Nintendo Switch logout successful',
-                'timestamp': datetime.now().isoformat()
+                'timestamp': g.now_iso
             })
         else:
-            return jsonify({
+            return ojson({
                 'success': False,
                 'error': 'Not authenticated'
-            }), 401
+            }, 401)
     except Exception as e:
-        return jsonify({
+        return ojson({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/api/nintendo/usage', methods=['GET'])
 def get_nintendo_usage():
     try:
         if not nintendo_manager.is_authenticated():
-            return jsonify({
+            return ojson({
                 'success': False,
                 'authenticated': False,
                 'error': 'Not authenticated'
-            }), 401
+            }, 401)
         
         stats = nintendo_manager.get_usage_stats()
-        return jsonify({
+        return ojson({
             'success': True,
             'usage_stats': stats,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': g.now_iso
         })
     except Exception as e:
-        return jsonify({
+        return ojson({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 # New Integrated Manager Endpoints
 @app.route('/api/nintendo/set_time_limit', methods=['POST'])
@@ -782,106 +1052,160 @@ def set_device_time_limit():
     """Set daily playtime limit for a device"""
     try:
         if not nintendo_manager.is_authenticated():
-            return jsonify({
+            return ojson({
                 'success': False,
                 'authenticated': False,
                 'error': 'Not authenticated'
-            }), 401
+            }, 401)
         
-        data = request.get_json() or {}
+        data = _json_body()
+        if data is None:
+            return ojson({'success': False, 'error': 'invalid json'}, 400)
         device_id = data.get('device_id')
         minutes = data.get('minutes')
         
         if not device_id or minutes is None:
-            return jsonify({
+            return ojson({
                 'success': False,
                 'error': 'device_id and minutes are required'
-            }), 400
+            }, 400)
         
         if not isinstance(minutes, int) or minutes < 0:
-            return jsonify({
+            return ojson({
                 'success': False,
                 'error': 'minutes must be a non-negative integer'
-            }), 400
+            }, 400)
         
         # Check if integrated manager has this method
-        if hasattr(nintendo_manager, 'set_daily_playtime_limit'):
-            success = nintendo_manager.set_daily_playtime_limit(device_id, minutes)
+        if _set_daily_playtime_limit is not None:
+            success = _set_daily_playtime_limit(device_id, minutes)
         else:
             # Fallback for simple manager
-            print(f"🎮 Setting daily limit for {device_id}: {minutes} minutes (stored only)")
+            logger.debug("Setting daily limit for %s: %s minutes (stored only)", device_id, minutes)
             success = True
         
-        return jsonify({
+        return ojson({
             'success': success,
             'device_id': device_id,
             'daily_limit_minutes': minutes,
             'message': f'Daily limit set to {minutes} minutes for {device_id}',
-            'timestamp': datetime.now().isoformat()
+            'timestamp': g.now_iso
         })
     
     except Exception as e:
-        return jsonify({
+        return ojson({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
+
+def _manager_error(e):
+    """500 response for a failed manager call; details go to the log, not the client"""
+    logger.exception("Nintendo manager call failed")
+    return ojson({'success': False, 'error': type(e).__name__}, 500)
+
+# set_bedtime success body with the fixed keys pre-rendered; only the
+# JSON-escaped values are filled in per request
+_BEDTIME_RESPONSE = ('{{"success":true,"status":"{status}","job_id":{job_id},"device_id":{device_id},'
+                     '"bedtime":"{bedtime}","message":{message},"timestamp":"{timestamp}"}}')
+
+# Bedtime changes go to the Nintendo service in the background; the most
+# recent jobs are kept so clients can poll /api/nintendo/bedtime_status/<id>
+BEDTIME_JOBS_KEPT = 256
+_bedtime_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='bedtime')
+_bedtime_jobs = OrderedDict()
+_bedtime_jobs_lock = threading.Lock()
+
+def _queue_bedtime(device_id, bedtime_hour, bedtime_minute):
+    job_id = uuid.uuid4().hex
+    future = _bedtime_pool.submit(_set_bedtime, device_id, bedtime_hour, bedtime_minute)
+    with _bedtime_jobs_lock:
+        _bedtime_jobs[job_id] = future
+        if len(_bedtime_jobs) > BEDTIME_JOBS_KEPT:
+            _bedtime_jobs.popitem(last=False)
+    return job_id
 
 @app.route('/api/nintendo/set_bedtime', methods=['POST'])
 def set_device_bedtime():
     """Set bedtime for a device"""
     try:
-        if not nintendo_manager.is_authenticated():
-            return jsonify({
-                'success': False,
-                'authenticated': False,
-                'error': 'Not authenticated'
-            }), 401
-        
-        data = request.get_json() or {}
-        device_id = data.get('device_id')
-        bedtime_hour = data.get('bedtime_hour')
-        bedtime_minute = data.get('bedtime_minute')
-        
-        if not device_id or bedtime_hour is None or bedtime_minute is None:
-            return jsonify({
-                'success': False,
-                'error': 'device_id, bedtime_hour, and bedtime_minute are required'
-            }), 400
-        
-        if not (0 <= bedtime_hour <= 23) or not (0 <= bedtime_minute <= 59):
-            return jsonify({
-                'success': False,
-                'error': 'Invalid time format (hour: 0-23, minute: 0-59)'
-            }), 400
-        
-        # Check if integrated manager has this method
-        if hasattr(nintendo_manager, 'set_bedtime'):
-            success = nintendo_manager.set_bedtime(device_id, bedtime_hour, bedtime_minute)
-        else:
-            # Fallback for simple manager
-            print(f"🎮 Setting bedtime for {device_id}: {bedtime_hour:02d}:{bedtime_minute:02d} (stored only)")
-            success = True
-        
-        return jsonify({
-            'success': success,
-            'device_id': device_id,
-            'bedtime': f'{bedtime_hour:02d}:{bedtime_minute:02d}',
-            'message': f'Bedtime set to {bedtime_hour:02d}:{bedtime_minute:02d} for {device_id}',
-            'timestamp': datetime.now().isoformat()
-        })
-    
+        authenticated = nintendo_manager.is_authenticated()
     except Exception as e:
-        return jsonify({
+        return _manager_error(e)
+    if not authenticated:
+        return ojson({
             'success': False,
-            'error': str(e)
-        }), 500
+            'authenticated': False,
+            'error': 'Not authenticated'
+        }, 401)
+    
+    data = _json_body()
+    if data is None:
+        return ojson({'success': False, 'error': 'invalid json'}, 400)
+    device_id = data.get('device_id')
+    bedtime_hour = data.get('bedtime_hour')
+    bedtime_minute = data.get('bedtime_minute')
+    
+    if not device_id or bedtime_hour is None or bedtime_minute is None:
+        return ojson({
+            'success': False,
+            'error': 'device_id, bedtime_hour, and bedtime_minute are required'
+        }, 400)
+    
+    # Coerce once so "21" and 21.0 are accepted and the formatting below sees ints
+    try:
+        bedtime_hour, bedtime_minute = int(bedtime_hour), int(bedtime_minute)
+    except (TypeError, ValueError):
+        bedtime_hour = bedtime_minute = -1
+    
+    if not (0 <= bedtime_hour < 24 and 0 <= bedtime_minute < 60):
+        return ojson({
+            'success': False,
+            'error': 'Invalid time format (hour: 0-23, minute: 0-59)'
+        }, 400)
+    
+    bedtime = f'{bedtime_hour:02d}:{bedtime_minute:02d}'
+    # Check if integrated manager has this method
+    if _set_bedtime is not None:
+        job_id = _queue_bedtime(device_id, bedtime_hour, bedtime_minute)
+        status, code = 'queued', 202
+        message = f'Bedtime {bedtime} queued for {device_id}'
+    else:
+        # Fallback for simple manager
+        logger.debug("Setting bedtime for %s: %s (stored only)", device_id, bedtime)
+        job_id, status, code = None, 'stored', 200
+        message = f'Bedtime set to {bedtime} for {device_id}'
+    
+    return Response(_BEDTIME_RESPONSE.format(
+        status=status,
+        job_id=_json_dumps(job_id).decode(),
+        device_id=_json_dumps(device_id).decode(),
+        bedtime=bedtime,
+        message=_json_dumps(message).decode(),
+        timestamp=g.now_iso
+    ).encode(), status=code, mimetype='application/json', direct_passthrough=True)
+
+@app.route('/api/nintendo/bedtime_status/<job_id>', methods=['GET'])
+def get_bedtime_status(job_id):
+    """Report the outcome of a queued set_bedtime call"""
+    with _bedtime_jobs_lock:
+        future = _bedtime_jobs.get(job_id)
+    if future is None:
+        return ojson({'success': False, 'error': 'Unknown job_id'}, 404)
+    
+    if not future.done():
+        return ojson({'success': True, 'job_id': job_id, 'status': 'running' if future.running() else 'queued'})
+    
+    error = future.exception()
+    if error is not None:
+        return ojson({'success': False, 'job_id': job_id, 'status': 'failed', 'error': str(error)})
+    return ojson({'success': bool(future.result()), 'job_id': job_id, 'status': 'done'})
 
 @app.route('/api/nintendo/integrated_status', methods=['GET'])
 def get_integrated_status():
     """Get detailed status of the integrated Nintendo manager"""
     try:
-        if hasattr(nintendo_manager, 'get_parental_control_status'):
-            status = nintendo_manager.get_parental_control_status()
+        if _get_parental_control_status is not None:
+            status = _get_parental_control_status()
         else:
             status = {
                 'enhanced_discovery_available': False,
@@ -889,32 +1213,82 @@ def get_integrated_status():
                 'authenticated': nintendo_manager.is_authenticated(),
                 'manager_type': 'Simple'
             }
-        
-        status['manager_type'] = 'Integrated' if INTEGRATED_MANAGER_AVAILABLE else 'Simple'
-        status['timestamp'] = datetime.now().isoformat()
-        
-        return jsonify({
-            'success': True,
-            'integrated_status': status
-        })
     except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+        return _manager_error(e)
+    
+    status['manager_type'] = 'Integrated' if INTEGRATED_MANAGER_AVAILABLE else 'Simple'
+    status['timestamp'] = g.now_iso
+    
+    return negotiated({
+        'success': True,
+        'integrated_status': status
+    })
+
+# Behind nginx, set STATIC_ACCEL_PREFIX to hand static files back to it via
+# X-Accel-Redirect so they are sent with sendfile instead of read through
+# Python. The prefix must map to this directory as an internal location, e.g.
+#   location /static-internal/ { internal; alias /home/pi/parental-controls/backend/; }
+STATIC_ACCEL_PREFIX = os.environ.get('STATIC_ACCEL_PREFIX', '')
+
+def _send_static(filename):
+    if not STATIC_ACCEL_PREFIX:
+        return send_from_directory('.', filename)
+    if safe_join('.', filename) is None:
+        abort(404)
+    response = Response(mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream')
+    response.headers['X-Accel-Redirect'] = STATIC_ACCEL_PREFIX.rstrip('/') + '/' + filename
+    return response
+
+DASHBOARD_FILE = 'enhanced_dashboard.html'
+
+# (mtime_ns, size, raw bytes, gzipped bytes, etag) of the dashboard, reloaded
+# only when the file changes
+_dashboard = None
+
+def _load_dashboard():
+    global _dashboard
+    st = os.stat(DASHBOARD_FILE)
+    if _dashboard is None or _dashboard[:2] != (st.st_mtime_ns, st.st_size):
+        raw = Path(DASHBOARD_FILE).read_bytes()
+        _dashboard = (st.st_mtime_ns, st.st_size, raw, gzip.compress(raw, compresslevel=6),
+                      hashlib.blake2b(raw, digest_size=8).hexdigest())
+    return _dashboard
+
+try:
+    _load_dashboard()
+except OSError:
+    pass
 
 # Serve static files
 @app.route('/')
 def serve_dashboard():
-    return send_from_directory('.', 'enhanced_dashboard.html')
+    if STATIC_ACCEL_PREFIX:
+        return _send_static(DASHBOARD_FILE)
+    try:
+        _, _, raw, gz, etag = _load_dashboard()
+    except OSError:
+        abort(404)
+    
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response = Response(gz, mimetype='text/html', direct_passthrough=True)
+        response.headers['Content-Encoding'] = 'gzip'
+        etag += '-gz'
+    else:
+        response = Response(raw, mimetype='text/html', direct_passthrough=True)
+    response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    return response.make_conditional(request)
 
 @app.route('/<path:filename>')
 def serve_static(filename):
-    return send_from_directory('.', filename)
+    return _send_static(filename)
 
-@app.route('/health')
-def health_check():
-    return jsonify({
+# Encoded /health bodies by mimetype; rebuilt at most once per HEALTH_CACHE_TTL
+_health_cache = {'ts': float('-inf'), 'bodies': {}}
+_health_lock = threading.Lock()
+
+def _encode_health():
+    health = {
         'status': 'healthy',
         'service': 'Parental Controls Backend with Nintendo Switch',
         'version': '1.1.0',
@@ -923,8 +1297,26 @@ def health_check():
             'mac_manager': 'healthy',
             'nintendo': 'connected' if nintendo_manager.is_authenticated() else 'available'
         },
-        'timestamp': datetime.now().isoformat()
-    })
+        'timestamp': g.now_iso
+    }
+    bodies = {'application/json': _json_dumps(health)}
+    if MSGSPEC_AVAILABLE:
+        bodies[MSGPACK_MIMETYPE] = msgspec.msgpack.encode(health)
+    return bodies
+
+@app.route('/health')
+def health_check():
+    if time.monotonic() - _health_cache['ts'] >= HEALTH_CACHE_TTL:
+        with _health_lock:
+            # Another probe may have rebuilt it while we waited
+            if time.monotonic() - _health_cache['ts'] >= HEALTH_CACHE_TTL:
+                _health_cache['bodies'] = _encode_health()
+                _health_cache['ts'] = time.monotonic()
+    
+    mimetype = MSGPACK_MIMETYPE if _wants_msgpack() else 'application/json'
+    response = Response(_health_cache['bodies'][mimetype], mimetype=mimetype, direct_passthrough=True)
+    response.vary.add('Accept')
+    return response
 
 if __name__ == '__main__':
     print("🚀 Starting Parental Controls Backend with Nintendo Switch")
@@ -946,4 +1338,14 @@ if __name__ == '__main__':
     print("📱 Dashboard: http://192.168.123.7:3001")
     print("🔧 Backend API: http://192.168.123.7:3001/api")
     
-    app.run(host='0.0.0.0', port=8444, debug=False)
+    # Prefer a production WSGI server: waitress keeps HTTP/1.1 connections
+    # alive across the dashboard's polls, unlike Flask's development server.
+    # Under gunicorn, point it at the app directly instead, e.g.
+    #   gunicorn -w 2 -k gthread --threads 4 --keep-alive 60 pi_backend_nintendo:app
+    try:
+        from waitress import serve
+        print("✅ Serving with waitress")
+        serve(app, host='0.0.0.0', port=8444, threads=8)
+    except ImportError:
+        print("⚠️ waitress not installed, using Flask development server")
+        app.run(host='0.0.0.0', port=8444, debug=False, threaded=True)
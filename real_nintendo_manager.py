@@ -27,7 +27,7 @@ except ImportError as e:
 class RealNintendoSwitchManager:
     """Real Nintendo Switch Parental Controls Manager"""
     
-    def __init__(self, config_file='nintendo_config.json'):
+    def __init__(self, config_file='nintendo_config.json', config: Optional[Dict[str, Any]] = None):
         self.config_file = config_file
         self.api: Optional[NintendoParental] = None
         self.authenticator: Optional[Authenticator] = None
@@ -36,8 +36,11 @@ class RealNintendoSwitchManager:
         self.last_update = None
         self.enhanced_discovery_available = True
         
-        # Load configuration
-        self.load_config()
+        # Load configuration (unless the caller already parsed it)
+        if config is None:
+            self.load_config()
+        else:
+            self.session_token = config.get('session_token')
         
         if NINTENDO_AVAILABLE and self.session_token:
             self.initialize_api()